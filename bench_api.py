@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Catalogue API Load Test
+Starts ideas_api.py in a separate process (or targets a running one with
+--url) and hammers it from keep-alive client threads with a mix of listings,
+filters, lookups and previews, with and without If-None-Match.
+
+Usage:
+    python bench_api.py                           # 10 s, 8 clients
+    python bench_api.py --seconds 30 --clients 32
+    python bench_api.py --url http://127.0.0.1:8765
+"""
+
+import argparse
+import http.client
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+import idea_shards
+
+BASE_DIR = Path(__file__).parent
+
+
+def request_mix(ideas, rng, n=500):
+    categories = sorted({i["category"] for i in ideas})
+    ids = [i["id"] for i in ideas]
+    targets = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.3:
+            targets.append(f"/ideas?page={rng.randint(1, 3)}")
+        elif roll < 0.5:
+            targets.append(f"/ideas?category={quote(rng.choice(categories))}&per_page=10")
+        elif roll < 0.6:
+            targets.append(f"/ideas?cost={rng.choice(['low', 'medium', 'high'])}&risk={rng.choice(['high', 'normal'])}")
+        elif roll < 0.85:
+            targets.append(f"/ideas/{rng.choice(ids)}")
+        elif roll < 0.95:
+            targets.append(f"/ideas/{rng.choice(ids)}/preview")
+        else:
+            targets.append("/categories")
+    return targets
+
+
+def client(host, port, targets, conditional, deadline, stats, lock, seed):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etags, statuses, latencies = {}, Counter(), []
+    while time.perf_counter() < deadline:
+        target = rng.choice(targets)
+        headers = {"If-None-Match": etags[target]} if conditional and target in etags else {}
+        started = time.perf_counter()
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            statuses["error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - started)
+        statuses[resp.status] += 1
+        if resp.getheader("ETag"):
+            etags[target] = resp.getheader("ETag")
+    conn.close()
+    with lock:
+        stats["statuses"].update(statuses)
+        stats["latencies"].extend(latencies)
+
+
+def run(host, port, targets, clients, seconds, conditional):
+    stats, lock = {"statuses": Counter(), "latencies": []}, threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=client, args=(host, port, targets, conditional, deadline, stats, lock, k))
+        for k in range(clients)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    lat = sorted(stats["latencies"]) or [0.0]
+    total = sum(stats["statuses"].values())
+    codes = ", ".join(f"{code}: {n}" for code, n in sorted(stats["statuses"].items(), key=str))
+    label = "If-None-Match" if conditional else "plain GET"
+    print(f"   {label:<14} {total / elapsed:8.0f} req/s   p50 {statistics.median(lat) * 1000:5.2f} ms   "
+          f"p99 {lat[int(0.99 * (len(lat) - 1))] * 1000:6.2f} ms   ({codes})")
+
+
+def wait_for(host, port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/categories")
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the catalogue API.")
+    parser.add_argument("--url", help="existing server (default: start one)")
+    parser.add_argument("--port", type=int, default=8799, help="port for the server started here")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        server = subprocess.Popen(
+            [sys.executable, str(BASE_DIR / "ideas_api.py"), "--host", host, "--port", str(port)],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        if not wait_for(host, port):
+            print(f"❌ No API answering on {host}:{port}")
+            sys.exit(1)
+        targets = request_mix(idea_shards.load_ideas(), random.Random(7))
+        print(f"📊 {args.clients} keep-alive clients, {args.seconds:g} s per run, "
+              f"{len(set(targets))} distinct URLs")
+        run(host, port, targets, args.clients, args.seconds, conditional=False)
+        run(host, port, targets, args.clients, args.seconds, conditional=True)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
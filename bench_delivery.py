@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Delivery Fan-Out Check
+Delivers a real briefing (built from the catalogue) through delivery.deliver
+to local stand-ins only: the SMTP stand-in from bench_replies.py plus an HTTP
+server with a fast, a slow (past its timeout), a flaky (fails twice, then
+accepts) and a broken endpoint, and a feed file in a temp directory. Prints
+when the email finished versus each channel, and what each channel received,
+then checks that a refused email posts to no channel at all, that a channel
+trickling its reply is cut off at the delivery deadline after the send was
+recorded, and that two briefings in the same second get separate feed items.
+
+Usage:
+    python bench_delivery.py
+    python bench_delivery.py --slow-s 5 --timeout 1 --deadline 2
+"""
+
+import argparse
+import json
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import daily_ideas_sender
+import delivery
+import idea_shards
+import mail_connections
+from bench_replies import StandInSMTP
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  HTTP STAND-IN
+# ═══════════════════════════════════════════════════════════════════════════
+class StandInHooks(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, slow_delay):
+        super().__init__(("127.0.0.1", 0), _HookHandler)
+        self.slow_delay = slow_delay
+        self.lock = threading.Lock()
+        self.hits = {}          # path -> number of requests
+        self.bodies = {}        # path -> last accepted JSON body
+
+
+class _HookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        srv = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with srv.lock:
+            srv.hits[self.path] = hit = srv.hits.get(self.path, 0) + 1
+        if self.path == "/slow":
+            time.sleep(srv.slow_delay)
+        if self.path == "/trickle":
+            # One byte at a time, each well inside the client's socket timeout
+            self.send_response(200)
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            try:
+                for _ in range(int(srv.slow_delay * 10)):
+                    self.wfile.write(b" ")
+                    self.wfile.flush()
+                    time.sleep(0.2)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+        status = 500 if self.path == "/broken" or (self.path == "/flaky" and hit <= 2) else 200
+        if status == 200:
+            with srv.lock:
+                srv.bodies[self.path] = json.loads(body)
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+        except BrokenPipeError:
+            pass                # the client timed out first — that's the point of /slow
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RUN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Check delivery fan-out against local stand-ins.")
+    parser.add_argument("--slow-s", type=float, default=3.0, help="how long /slow takes to answer")
+    parser.add_argument("--timeout", type=float, default=1.0, help="per-attempt channel timeout")
+    parser.add_argument("--deadline", type=float, default=2.0, help="delivery_deadline for the trickle check")
+    parser.add_argument("--login-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    smtp = StandInSMTP(args.login_ms / 1000, 0.05)
+    hooks = StandInHooks(args.slow_s)
+    for srv in (smtp, hooks):
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{hooks.server_address[1]}"
+
+    ideas = idea_shards.load_ideas()[:3]
+    date_str = time.strftime("%B %d, %Y")
+    html = daily_ideas_sender.build_email(ideas, date_str)
+    text = daily_ideas_sender.build_text(ideas, date_str)
+    message = delivery.make_message("briefing", f"🚀 CEO Briefing — {date_str}", html, text, ideas)
+
+    saved_backoff = delivery.RETRY_BACKOFF
+    delivery.RETRY_BACKOFF = 0.1
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = Path(tmp) / "feed.json"
+        config = {
+            "smtp_server": "127.0.0.1", "smtp_port": smtp.server_address[1], "smtp_starttls": False,
+            "sender_email": "bench@example.com", "sender_password": "x", "recipient_email": "bench@example.com",
+            "channels": [
+                {"type": "webhook", "name": "slack", "url": f"{base}/fast", "format": "slack"},
+                {"type": "webhook", "name": "telegram", "url": f"{base}/flaky", "format": "telegram", "chat_id": "42"},
+                {"type": "webhook", "name": "slow", "url": f"{base}/slow", "format": "json"},
+                {"type": "webhook", "name": "broken", "url": f"{base}/broken", "format": "json", "retries": 1},
+                {"type": "feed", "path": str(feed)},
+            ],
+        }
+        for ch in config["channels"]:
+            ch.setdefault("timeout", args.timeout)
+
+        email_done = {}
+
+        def timed_send(cfg, subject, body):
+            daily_ideas_sender.send_email(cfg, subject, body)
+            email_done["s"] = time.perf_counter() - started
+
+        try:
+            mail_connections.close_all()
+            started = time.perf_counter()
+            results = delivery.deliver({**config, "channels": []}, message, timed_send)
+            print(f"📊 email alone:        {email_done['s'] * 1000:7.0f} ms")
+
+            mail_connections.close_all()
+            started = time.perf_counter()
+            results = delivery.deliver(config, message, timed_send)
+            total = time.perf_counter() - started
+            print(f"📊 email with fan-out: {email_done['s'] * 1000:7.0f} ms   (all channels settled after {total * 1000:.0f} ms)")
+            for name, r in results.items():
+                mark = "✅" if r["ok"] else "❌"
+                print(f"   {mark} {name:<9} {r['ms']:6d} ms  {r['attempts']} attempt(s)  {r.get('error', '')}")
+
+            print(f"   slack got:    {json.dumps(hooks.bodies.get('/fast'), ensure_ascii=False)[:90]}…")
+            print(f"   telegram got: chat_id={hooks.bodies.get('/flaky', {}).get('chat_id')} after {hooks.hits.get('/flaky')} tries")
+            items = delivery.load_json(feed)["items"]
+            print(f"   feed:         {len(items)} item(s), tags {items[0]['tags']}")
+            print(f"   smtp:         {smtp.messages} message(s)")
+
+            # Email refused: the run fails before any channel is touched
+            hits, feed_items = sum(hooks.hits.values()), len(items)
+            refused = {**config, "smtp_port": _closed_port()}
+            mail_connections.close_all()
+            try:
+                delivery.deliver(refused, delivery.make_message("briefing", "refused", html, text, ideas), timed_send)
+                print("❌ refused email did not raise")
+            except OSError as e:
+                posted = sum(hooks.hits.values()) - hits + len(delivery.load_json(feed)["items"]) - feed_items
+                print(f"{'✅' if not posted else '❌'} email refused ({type(e).__name__}): {posted} channel post(s)")
+
+            # Trickling webhook: the send is recorded first, the wait stops at the deadline
+            trickle = {**config, "delivery_deadline": args.deadline, "channels": [
+                {"type": "webhook", "name": "trickle", "url": f"{base}/trickle", "format": "json",
+                 "timeout": args.timeout, "retries": 0}]}
+            recorded = {}
+            mail_connections.close_all()
+            started = time.perf_counter()
+            results = delivery.deliver(trickle, message, timed_send,
+                                       on_sent=lambda r: recorded.setdefault("s", time.perf_counter() - started))
+            total = time.perf_counter() - started
+            ok = "s" in recorded and recorded["s"] <= email_done["s"] + 0.05 and total < args.deadline + 1
+            print(f"{'✅' if ok else '❌'} trickling channel: send recorded after {recorded.get('s', 0) * 1000:.0f} ms, "
+                  f"returned after {total * 1000:.0f} ms ({results['trickle'].get('error', 'delivered')})")
+
+            # Two briefings in the same second stay two feed items
+            sent_at = datetime.now()
+            before = len(delivery.load_json(feed)["items"])
+            for n in range(2):
+                delivery.write_feed({"path": str(feed)}, delivery.make_message(
+                    "briefing", f"same second {n}", html, text, ideas, sent_at), args.timeout)
+            added = len(delivery.load_json(feed)["items"]) - before
+            print(f"{'✅' if added == 2 else '❌'} same-second briefings: {added} new feed item(s)")
+        finally:
+            delivery.RETRY_BACKOFF = saved_backoff
+            mail_connections.close_all()
+            smtp.shutdown()
+            hooks.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Reply Handling Benchmark
+Runs reply_checker.process_replies against a local SMTP stand-in that models
+a slow remote server (connect+login latency, per-message latency), comparing
+the old one-login-per-reply behaviour with batched, pooled, concurrent
+handling. Nothing leaves the machine.
+
+Usage:
+    python bench_replies.py                  # 40 replies from 8 senders
+    python bench_replies.py 200 20 --login-ms 300 --data-ms 80
+"""
+
+import argparse
+import random
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import engagement_stats
+import mail_connections
+import reply_checker
+
+BASE_DIR = Path(__file__).parent
+PENDING_FILE = BASE_DIR / "pending_details.json"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SMTP STAND-IN
+# ═══════════════════════════════════════════════════════════════════════════
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, login_delay, data_delay):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.login_delay = login_delay
+        self.data_delay = data_delay
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.logins = 0
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        srv = self.server
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="ignore").strip().split(" ", 1)[0].upper()
+            if cmd in ("EHLO", "HELO"):
+                self.reply("250-stand-in")
+                self.reply("250 AUTH PLAIN")
+            elif cmd == "AUTH":
+                time.sleep(srv.login_delay)     # stands in for TCP + TLS + LOGIN round trips
+                with srv.lock:
+                    srv.logins += 1
+                self.reply("235 ok")
+            elif cmd == "DATA":
+                self.reply("354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(srv.data_delay)
+                with srv.lock:
+                    srv.messages += 1
+                self.reply("250 queued")
+            elif cmd == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+def synthetic_replies(pending, n, senders, seed=5):
+    rng = random.Random(seed)
+    names = list(pending["ideas"].keys())
+    return [{
+        "msg_id": f"<bench-{k}@local>",
+        "subject": "Re: CEO Briefing",
+        "from": f"Reader {k % senders} <reader{k % senders}@example.com>",
+        "body": " and ".join(rng.sample(names, rng.randint(1, 2))),
+    } for k in range(n)]
+
+
+def run(label, server, base_config, pending, replies, **overrides):
+    config = dict(base_config, **overrides)
+    mail_connections.close_all()
+    server.messages = server.logins = 0
+    started = time.perf_counter()
+    done = reply_checker.process_replies(config, pending, replies)
+    elapsed = time.perf_counter() - started
+    mail_connections.close_all()
+    print(f"   {label:<34} {elapsed:6.2f} s  {len(done) / elapsed:7.1f} replies/s  "
+          f"{server.messages:3d} emails  {server.logins:3d} logins")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reply handling against a local SMTP stand-in.")
+    parser.add_argument("replies", type=int, nargs="?", default=40)
+    parser.add_argument("senders", type=int, nargs="?", default=8)
+    parser.add_argument("--login-ms", type=float, default=200)
+    parser.add_argument("--data-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    pending = reply_checker.load_json(PENDING_FILE)
+    replies = synthetic_replies(pending, args.replies, args.senders)
+
+    server = StandInSMTP(args.login_ms / 1000, args.data_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config = {
+        "smtp_server": "127.0.0.1", "smtp_port": server.server_address[1], "smtp_starttls": False,
+        "sender_email": "bench@example.com", "sender_password": "x", "recipient_email": "bench@example.com",
+    }
+
+    saved_store, saved_idle = engagement_stats.STORE_DIR, mail_connections.MAX_IDLE
+    with tempfile.TemporaryDirectory() as tmp:
+        engagement_stats.STORE_DIR = Path(tmp)
+        try:
+            print(f"📊 {args.replies} replies from {args.senders} senders "
+                  f"(login {args.login_ms:g} ms, send {args.data_ms:g} ms)")
+            mail_connections.MAX_IDLE = 0      # never reuse: one login per email, as before
+            run("one at a time, login per email", server, config, pending, replies,
+                batch_replies=False, reply_workers=1)
+            mail_connections.MAX_IDLE = saved_idle
+            run("one at a time, pooled", server, config, pending, replies,
+                batch_replies=False, reply_workers=1)
+            run("batched per sender, pooled", server, config, pending, replies,
+                batch_replies=True, reply_workers=1)
+            run("batched per sender, 4 workers", server, config, pending, replies,
+                batch_replies=True, reply_workers=4)
+        finally:
+            engagement_stats.STORE_DIR = saved_store
+            mail_connections.MAX_IDLE = saved_idle
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,6 @@ Delivers a high-level strategic briefing with 3 actionable ideas + 1 execution t
 """
 
 import json
-import random
-import smtplib
 import sys
 import logging
 from email.mime.text import MIMEText
@@ -14,6 +12,15 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from pathlib import Path
 
+import delivery
+import derived_fields
+import engagement_stats
+import idea_selection
+import idea_shards
+import mail_connections
+import report_archive
+import state_files
+
 BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / "config.json"
 IDEAS_FILE = BASE_DIR / "ideas_database.json"
@@ -40,36 +47,20 @@ def save_json(fp, data):
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def select_ideas(ideas, history, count=3):
-    sent = set(history.get("sent_ids", []))
-    
-    available = [i for i in ideas if i["id"] not in sent]
-    
-    if len(available) < count:
+def select_ideas(ideas, history, count=3, constraints=None):
+    # Unsent ideas, bucketed by category / cost / risk / priority (kept between runs)
+    pools = idea_selection.pools_for(ideas, history.get("sent_ids", []))
+
+    if len(pools) < count:
         log.warning("⚠ Cycling database (running low on fresh ideas).")
         history["sent_ids"] = [] # Reset history
-        available = ideas
+        pools.reset()
+
+    # Priority ideas (freshly added) first, within the variety rules; order is shuffled
+    selected, relaxed = pools.select(count, constraints)
+    if relaxed:
+        log.warning(f"⚠ Relaxed selection rules to fill the briefing: {', '.join(relaxed)}")
 
-    # Prioritize "priority" ideas (freshly added)
-    priority_ideas = [i for i in available if i.get("priority") is True]
-    regular_ideas = [i for i in available if i.get("priority") is not True]
-    
-    selected = []
-    
-    # 1. Take priority ideas first (randomized within priority group)
-    if priority_ideas:
-        take = min(count, len(priority_ideas))
-        selected.extend(random.sample(priority_ideas, take))
-        
-    # 2. Fill remaining slots from regular ideas
-    remaining_slots = count - len(selected)
-    if remaining_slots > 0 and regular_ideas:
-        take = min(remaining_slots, len(regular_ideas))
-        selected.extend(random.sample(regular_ideas, take))
-    
-    # Shuffle the final selection so priority ideas aren't always top if mixed
-    random.shuffle(selected)
-        
     return selected, history
 
 
@@ -83,29 +74,32 @@ def render_idea_html(idea):
     revenue = idea.get('monetization', 'NPR 5 Lakhs/mo') # Placeholder if not specific
     # Extract just the first action plan item for "Execution Task" candidate
     first_action = idea.get('action_plan', ["Research the market"])[0] 
+    # First sentences / MVP steps, precomputed at ingest
+    derived = derived_fields.for_idea(idea)
+    lead = derived["lead"]
         
     return f"""
     <div style="margin-bottom: 40px; padding: 25px; background: #fff; border: 1px solid #e5e7eb; border-radius: 12px; box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);">
         <h2 style="margin: 0 0 10px; color: #111827; font-size: 22px; font-weight: 800;">💡 {idea['business_name']}</h2>
         
         <p style="margin: 0 0 20px; color: #4b5563; font-size: 16px; line-height: 1.5;">
-            🔹 {idea['what_it_does'].split('.')[0]}. (Simple & Clear)
+            🔹 {lead['what_it_does']} (Simple & Clear)
         </p>
         
         <div style="display: grid; grid-template-columns: 1fr; gap: 15px;">
             <div>
                 <strong style="color: #374151; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">🎯 Target Customer</strong>
-                <div style="color: #1f2937; margin-top: 4px;">{idea.get('nepal_adaptation', 'Nepali Businesses').split('.')[0]}</div>
+                <div style="color: #1f2937; margin-top: 4px;">{lead['nepal_adaptation'].rstrip('.') or 'Nepali Businesses'}</div>
             </div>
             
             <div>
                 <strong style="color: #374151; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">💰 Revenue Potential</strong>
-                <div style="color: #059669; font-weight: 700; margin-top: 4px;">{idea.get('monetization', '').split('.')[0]}</div>
+                <div style="color: #059669; font-weight: 700; margin-top: 4px;">{lead['monetization'].rstrip('.')}</div>
             </div>
             
             <div>
                 <strong style="color: #374151; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">🧠 Why Now?</strong>
-                <div style="color: #1f2937; margin-top: 4px;">{idea['why_growing'].split('.')[0]}.</div>
+                <div style="color: #1f2937; margin-top: 4px;">{lead['why_growing']}</div>
             </div>
             
             <div style="background: #f3f4f6; padding: 15px; border-radius: 8px; margin-top: 10px;">
@@ -126,7 +120,7 @@ def render_idea_html(idea):
              <div style="margin-top: 15px;">
                 <strong style="color: #374151; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px;">🚀 Simple MVP Plan:</strong>
                 <ol style="margin: 8px 0 0; padding-left: 20px; color: #4b5563; font-size: 14px; line-height: 1.6;">
-                    {''.join(f'<li>{step}</li>' for step in idea.get('action_plan', [])[:4])}
+                    {''.join(f'<li>{step}</li>' for step in derived['mvp_plan'])}
                 </ol>
             </div>
         </div>
@@ -186,6 +180,17 @@ def build_email(ideas, date_str):
 </html>"""
 
 
+def build_text(ideas, date_str):
+    """Compact plain-text briefing for chat channels."""
+    lines = [f"🚀 CEO Daily Briefing — {date_str}", ""]
+    for n, idea in enumerate(ideas, 1):
+        lines.append(f"{n}. {idea['business_name']} ({idea['category']}, {idea['startup_cost']} cost)")
+        lines.append(f"   {derived_fields.for_idea(idea)['lead']['what_it_does']}")
+    task = ideas[0].get('action_plan', ["Market Research"])[0]
+    lines += ["", f"⭐ Today's task: {task}"]
+    return "\n".join(lines)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  EMAIL SEND
 # ═══════════════════════════════════════════════════════════════════════════
@@ -197,11 +202,7 @@ def send_email(config, subject, html):
     msg.attach(MIMEText(html, "html", "utf-8"))
     
     try:
-        with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as s:
-            s.ehlo()
-            s.starttls()
-            s.ehlo()
-            s.login(config["sender_email"], config["sender_password"])
+        with mail_connections.smtp_connection(config) as s:
             s.send_message(msg)
         log.info("📧 Email sent to %s", config["recipient_email"])
     except Exception as e:
@@ -217,12 +218,15 @@ def main():
     log.info("🚀 CEO Briefing Automation — Starting")
     log.info("=" * 60)
 
-    config = load_json(CONFIG_FILE)
-    ideas = load_json(IDEAS_FILE)
+    config = state_files.load_cached(CONFIG_FILE)
+    # Manifest stubs when the database is sharded; full shards are read after selection
+    ideas = idea_shards.catalogue_index()
     history = load_json(HISTORY_FILE) if HISTORY_FILE.exists() else {"sent_ids":[], "log":[]}
 
-    # Select 3 Ideas
-    selected_ideas, history = select_ideas(ideas, history, count=3)
+    # Select 3 Ideas (variety rules from config "selection")
+    selected_ideas, history = select_ideas(ideas, history, count=3,
+                                           constraints=idea_selection.load_constraints(config))
+    selected_ideas = idea_shards.fetch(selected_ideas)
     
     if not selected_ideas:
         log.error("❌ No ideas found to send!")
@@ -238,24 +242,44 @@ def main():
     # Build Content
     html = build_email(selected_ideas, date_str)
 
-    # Send
-    send_email(config, subject, html)
-
-    # Update History
-    for i in selected_ideas:
-        history["sent_ids"].append(i["id"])
-    
-    history["log"].append({
+    # Send: email first, then chat/feed channels concurrently (none of them if the email fails)
+    message = delivery.make_message("briefing", subject, html, build_text(selected_ideas, date_str), selected_ideas)
+    entry = {
         "date": datetime.now().strftime("%Y-%m-%d"),
-        "ideas": [i["business_name"] for i in selected_ideas]
-    })
-    
-    save_json(HISTORY_FILE, history)
+        "ideas": [i["business_name"] for i in selected_ideas],
+        "ids": [i["id"] for i in selected_ideas],
+    }
+
+    def record_sent(delivered):
+        # Update History as soon as the email is out, before waiting on the other channels
+        for i in selected_ideas:
+            history["sent_ids"].append(i["id"])
+        history["log"].append(dict(entry, delivery={name: r["ok"] for name, r in delivered.items()}))
+        save_json(HISTORY_FILE, history)
+        try:
+            engagement_stats.append_events("sent", [i["id"] for i in selected_ideas])
+        except Exception as e:
+            log.warning(f"⚠ Could not record send analytics: {e}")
+        idea_shards.update_unsent(history["sent_ids"])
+
+    delivered = delivery.deliver(config, message, send_email, on_sent=record_sent)
+    if len(delivered) > 1:
+        history["log"][-1]["delivery"] = {name: r["ok"] for name, r in delivered.items()}
+        save_json(HISTORY_FILE, history)
+
+    if config.get("save_reports"):
+        try:
+            report_archive.save_message(config, "briefing", subject, html,
+                                        [render_idea_html(i) for i in selected_ideas])
+        except Exception as e:
+            log.warning(f"⚠ Could not archive report: {e}")
+
     log.info("✅ CEO Briefing Sent Successfully!")
 
 if __name__ == "__main__":
     try:
-        main()
+        with state_files.state_lock():
+            main()
     except Exception as e:
         log.error(f"❌ Fatal: {e}", exc_info=True)
         sys.exit(1)
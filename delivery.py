@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Delivery Channels
+Fans one briefing out to every configured channel. Email goes out first, on
+the calling thread exactly as before; only once it has been sent do the other
+channels run, concurrently on worker threads, each with its own timeout and
+retries. A slow or broken channel never delays the email or fails the run,
+and a failed email publishes nothing anywhere else, so the retried run that
+actually records the ideas in history is the only one the channels see. The
+caller records the send (on_sent) before the channels are waited on, and the
+wait as a whole is capped by "delivery_deadline" seconds, since a server that
+trickles its reply can outlast a per-socket timeout.
+
+Channels are configured in config.json (email is always on):
+
+    "channels": [
+        {"type": "webhook", "name": "slack", "url": "https://hooks.slack.com/services/…", "format": "slack"},
+        {"type": "webhook", "name": "telegram", "url": "https://api.telegram.org/bot<token>/sendMessage",
+         "format": "telegram", "chat_id": "123456", "timeout": 10, "retries": 2},
+        {"type": "webhook", "url": "http://localhost:9000/ideas", "format": "json"},
+        {"type": "feed", "path": "feed.json", "max_items": 60}
+    ]
+
+Webhook formats: "slack" posts {"text"}, "telegram" {"chat_id", "text"}, "json"
+the whole message (subject, date, text, html, ideas). A feed channel keeps a
+JSON Feed 1.1 file, newest item first.
+
+Usage:
+    python delivery.py      # list configured channels
+"""
+
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+
+DEFAULT_TIMEOUT = 10        # seconds per attempt
+DEFAULT_RETRIES = 2         # extra attempts after the first
+DEFAULT_DEADLINE = 30       # seconds the run waits for all channels together
+RETRY_BACKOFF = 1.0         # seconds, doubled per retry
+DEFAULT_FEED_ITEMS = 60
+FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+log = logging.getLogger("delivery")
+
+_feed_lock = threading.Lock()
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+def save_json(fp, data):
+    tmp = fp.with_name(fp.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp.replace(fp)
+
+
+class ChannelError(Exception):
+    """A delivery attempt failed in a way worth retrying."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CHANNELS
+# ═══════════════════════════════════════════════════════════════════════════
+def webhook_payload(channel, message):
+    fmt = channel.get("format", "json")
+    if fmt == "slack":
+        return {"text": message["text"]}
+    if fmt == "telegram":
+        return {"chat_id": channel["chat_id"], "text": message["text"], "disable_web_page_preview": True}
+    if fmt == "json":
+        return message
+    raise ValueError(f"unknown webhook format {fmt!r}")
+
+
+def post_webhook(channel, message, timeout):
+    body = json.dumps(webhook_payload(channel, message), ensure_ascii=False).encode("utf-8")
+    req = urllib.request.Request(
+        channel["url"], data=body, method="POST",
+        headers={"Content-Type": "application/json; charset=utf-8", **channel.get("headers", {})},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+    except urllib.error.HTTPError as e:
+        raise ChannelError(f"HTTP {e.code}")
+    except (urllib.error.URLError, OSError) as e:
+        raise ChannelError(str(getattr(e, "reason", e)))
+
+
+def write_feed(channel, message, timeout):
+    fp = Path(channel.get("path", "feed.json"))
+    if not fp.is_absolute():
+        fp = BASE_DIR / fp
+    item = {
+        "id": message["id"],
+        "title": message["subject"],
+        "content_html": message["html"],
+        "content_text": message["text"],
+        "date_published": message["sent_at"],
+        "tags": sorted({i["category"] for i in message["ideas"]}),
+    }
+    with _feed_lock:
+        feed = load_json(fp) if fp.exists() else {}
+        items = [i for i in feed.get("items", []) if i.get("id") != item["id"]]
+        feed = {
+            "version": FEED_VERSION,
+            "title": channel.get("title", "Daily Business Ideas"),
+            "items": ([item] + items)[:channel.get("max_items", DEFAULT_FEED_ITEMS)],
+        }
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        save_json(fp, feed)
+
+
+# type -> fn(channel, message, timeout); raise ChannelError (retried) or anything else (not retried)
+CHANNELS = {
+    "webhook": post_webhook,
+    "feed": write_feed,
+}
+
+
+def channel_name(channel):
+    return channel.get("name") or channel.get("format") or channel["type"]
+
+
+def _deliver_one(channel, message):
+    """Run one channel with retries; never raises."""
+    name = channel_name(channel)
+    timeout = channel.get("timeout", DEFAULT_TIMEOUT)
+    attempts = 1 + max(0, channel.get("retries", DEFAULT_RETRIES))
+    started = time.perf_counter()
+    error = None
+    for attempt in range(1, attempts + 1):
+        try:
+            CHANNELS[channel["type"]](channel, message, timeout)
+            log.info(f"📤 Delivered to {name}")
+            return {"ok": True, "attempts": attempt, "ms": round((time.perf_counter() - started) * 1000)}
+        except ChannelError as e:
+            error = str(e)
+            if attempt < attempts:
+                time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            break
+    log.warning(f"⚠ Delivery to {name} failed after {attempt} attempt(s): {error}")
+    return {"ok": False, "attempts": attempt, "ms": round((time.perf_counter() - started) * 1000), "error": error}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FAN-OUT
+# ═══════════════════════════════════════════════════════════════════════════
+def make_message(kind, subject, html, text, ideas, sent_at=None):
+    sent_at = sent_at or datetime.now()
+    return {
+        "id": f"{kind}-{sent_at.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}",
+        "kind": kind,
+        "subject": subject,
+        "date": sent_at.strftime("%Y-%m-%d"),
+        "sent_at": sent_at.astimezone().isoformat(timespec="seconds"),
+        "text": text,
+        "html": html,
+        "ideas": [{"id": i.get("id"), "business_name": i["business_name"], "category": i["category"]}
+                  for i in ideas],
+    }
+
+
+def configured_channels(config, kind):
+    """Channels from config that take this kind of message (default: briefings only)."""
+    out = []
+    for channel in config.get("channels", []):
+        if channel.get("enabled", True) is False or kind not in channel.get("kinds", ["briefing"]):
+            continue
+        if channel.get("type") not in CHANNELS:
+            log.warning(f"⚠ Unknown channel type {channel.get('type')!r}, skipped")
+            continue
+        out.append(channel)
+    return out
+
+
+def deliver(config, message, send_email, on_sent=None):
+    """Send by email (this thread), then to every other channel (concurrently).
+
+    send_email(config, subject, html) failures propagate as before, before any
+    other channel is tried; other channels only report. on_sent(results) runs
+    as soon as the email is out, so the send is recorded even if the process
+    dies while a channel hangs. Channels still running after the deadline are
+    reported as failed and left to finish on their own. Returns
+    {channel name: result}, email included.
+    """
+    started = time.perf_counter()
+    send_email(config, message["subject"], message["html"])
+    results = {"email": {"ok": True, "attempts": 1, "ms": round((time.perf_counter() - started) * 1000)}}
+    if on_sent:
+        on_sent(results)
+
+    channels = configured_channels(config, message["kind"])
+    if not channels:
+        return results
+    pool = ThreadPoolExecutor(max_workers=len(channels), thread_name_prefix="delivery")
+    deadline = time.monotonic() + config.get("delivery_deadline", DEFAULT_DEADLINE)
+    try:
+        futures = {}
+        for k, channel in enumerate(channels, 1):
+            name = channel_name(channel)
+            futures[name if name not in futures else f"{name}-{k}"] = pool.submit(_deliver_one, channel, message)
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                log.warning(f"⚠ Delivery to {name} still running at the deadline, not waiting for it")
+                results[name] = {"ok": False, "attempts": None,
+                                 "ms": round((time.perf_counter() - started) * 1000), "error": "deadline exceeded"}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    config = load_json(CONFIG_FILE) if CONFIG_FILE.exists() else {}
+    print("   email       (always)")
+    for channel in config.get("channels", []):
+        state = "" if channel.get("enabled", True) else "  [disabled]"
+        target = channel.get("url") or channel.get("path", "feed.json")
+        print(f"   {channel_name(channel):<11} {channel.get('type', '?'):<8} {target}{state}")
+
+
+if __name__ == "__main__":
+    main()
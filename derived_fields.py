@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Derived Display Fields
+The email renderers show the first sentence of what_it_does, nepal_adaptation,
+monetization and why_growing, the first four action-plan steps, a colour for
+the startup cost and a high-risk label. Those only depend on the record, so
+they are computed when records are written (generate_database.py,
+update_database.py) and stored under "derived":
+
+    "derived": {"version": 2, "source": "<hash of the source fields>",
+                "lead": {"what_it_does": "…", …}, "mvp_plan": […],
+                "cost_color": "#22c55e", "label": null}
+
+A record is only recomputed when its source fields (or DERIVED_VERSION)
+change; that is checked where records are written (refresh / check), not on
+render. Renderers read the stored fields via for_idea(), which only computes
+them for records that have none or carry an older DERIVED_VERSION.
+
+Usage:
+    python derived_fields.py refresh     # (re)compute for the database / shards that need it
+    python derived_fields.py check       # how many records are missing or stale
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import idea_shards
+import state_files
+
+BASE_DIR = Path(__file__).parent
+IDEAS_FILE = BASE_DIR / "ideas_database.json"
+
+DERIVED_VERSION = 2      # 2: sentences may start lower-case ("eSewa/Khalti …")
+LEAD_FIELDS = ("what_it_does", "nepal_adaptation", "monetization", "why_growing")
+SOURCE_FIELDS = LEAD_FIELDS + ("action_plan", "startup_cost", "is_high_risk")
+MVP_STEPS = 4
+COST_COLORS = {"Low": "#22c55e", "Medium": "#f59e0b", "High": "#ef4444"}
+DEFAULT_COST_COLOR = "#64748b"
+HIGH_RISK_LABEL = "🔥 HIGH-RISK HIGH-REWARD"
+
+# Lower-case words that take a period without ending a sentence
+ABBREVIATIONS = {
+    "e.g", "i.e", "vs", "approx", "rs", "npr", "pvt", "ltd", "inc", "co", "corp",
+    "mr", "mrs", "ms", "dr", "st", "no", "govt", "dept", "est", "u.s", "u.k", "fig", "cf",
+}
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+def save_json(fp, data):
+    with open(fp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SENTENCES
+# ═══════════════════════════════════════════════════════════════════════════
+def first_sentence(text):
+    """First sentence of text, terminator included.
+
+    A '.', '!' or '?' ends a sentence only when followed by whitespace (or the
+    end), so "Node.js", "₨1.5" and "e.g.," don't; a '.' after a known
+    abbreviation or a single-letter initial doesn't either. The next word's
+    case doesn't matter: "… platform. eSewa/Khalti payments." splits after
+    "platform.", and "… costs ₨5-10 Lakhs. Then …" after "Lakhs.".
+    """
+    text = " ".join(str(text or "").split())
+    for i, ch in enumerate(text):
+        if ch not in ".!?" or (i + 1 < len(text) and text[i + 1] != " "):
+            continue
+        if ch == ".":
+            word = text[:i].rsplit(" ", 1)[-1].lstrip("([{\"'").lower()
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+        return text[:i + 1]
+    return text
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  DERIVED FIELDS
+# ═══════════════════════════════════════════════════════════════════════════
+def source_hash(idea):
+    source = [DERIVED_VERSION] + [idea.get(f) for f in SOURCE_FIELDS]
+    return hashlib.sha1(json.dumps(source, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def compute(idea):
+    return {
+        "version": DERIVED_VERSION,
+        "source": source_hash(idea),
+        "lead": {f: first_sentence(idea.get(f, "")) for f in LEAD_FIELDS},
+        "mvp_plan": list(idea.get("action_plan", []))[:MVP_STEPS],
+        "cost_color": COST_COLORS.get(idea.get("startup_cost", ""), DEFAULT_COST_COLOR),
+        "label": HIGH_RISK_LABEL if idea.get("is_high_risk") else None,
+    }
+
+
+def is_current(idea):
+    derived = idea.get("derived")
+    return bool(derived) and derived.get("version") == DERIVED_VERSION and derived.get("source") == source_hash(idea)
+
+
+def refresh(ideas):
+    """Store derived fields on records whose source changed (in place). Returns how many."""
+    changed = 0
+    for idea in ideas:
+        if not is_current(idea):
+            idea["derived"] = compute(idea)
+            changed += 1
+    return changed
+
+
+def for_idea(idea):
+    """Derived fields for rendering: the stored ones, or computed if missing or of an older version.
+
+    The source hash isn't checked here (that would cost more than computing);
+    run 'python derived_fields.py refresh' after editing records by hand.
+    """
+    derived = idea.get("derived")
+    if derived and derived.get("version") == DERIVED_VERSION:
+        return derived
+    return compute(idea)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if cmd not in ("refresh", "check"):
+        print(f"❌ Unknown command: {cmd} (use refresh or check)")
+        sys.exit(2)
+
+    if idea_shards.is_sharded():
+        manifest = idea_shards.load_manifest()
+        stale, touched = 0, {}
+        for category, entry in manifest["shards"].items():
+            ideas = load_json(idea_shards.SHARDS_DIR / entry["file"])
+            n = sum(1 for i in ideas if not is_current(i))
+            stale += n
+            if n and cmd == "refresh":
+                refresh(ideas)
+                touched[category] = ideas
+        if touched:
+            history = load_json(idea_shards.HISTORY_FILE) if idea_shards.HISTORY_FILE.exists() else {}
+            idea_shards.write_shards(touched, history.get("sent_ids", []))
+    else:
+        ideas = load_json(IDEAS_FILE)
+        stale = refresh(ideas)
+        if stale and cmd == "refresh":
+            save_json(IDEAS_FILE, ideas)
+
+    if cmd == "check":
+        print(f"{'✅' if not stale else 'ℹ'} {stale} record(s) with missing or outdated derived fields")
+    else:
+        print(f"✅ Recomputed derived fields for {stale} record(s)")
+
+
+if __name__ == "__main__":
+    with state_files.state_lock():     # refresh rewrites the database / shards
+        main()
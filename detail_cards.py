@@ -0,0 +1,109 @@
+"""
+Daily Business Ideas — Detail Cards
+The full-breakdown HTML sent in answer to replies and served by the API's
+/ideas/<id>/preview. Kept free of side effects (no logging setup, no config)
+so read-only processes can render cards without importing reply_checker.
+"""
+
+import derived_fields
+
+
+def render_detail_card(idea: dict, idx: int) -> str:
+    is_hr = idea.get("is_high_risk", False)
+    derived = derived_fields.for_idea(idea)
+    border_color = "#e94560" if is_hr else "#2d2d4a"
+    label = derived["label"] or f"💡 Idea #{idx}"
+    cost_color = derived["cost_color"]
+
+    action_rows = ""
+    for step in idea.get("action_plan", []):
+        action_rows += f'<tr><td style="padding:4px 8px;font-size:12px;color:#cbd5e1;border-bottom:1px solid #2d2d4a;">{step}</td></tr>'
+
+    hr_box = ""
+    if is_hr:
+        hr_box = f"""
+        <table width="100%" style="margin-top:16px;" cellpadding="0" cellspacing="8">
+        <tr>
+          <td width="50%" style="background:#1a0a0a;border-radius:8px;padding:12px;vertical-align:top;">
+            <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#ef4444;">⚠ WHY HIGH RISK</p>
+            <p style="margin:0;font-size:13px;color:#fca5a5;line-height:1.5;">{idea.get('high_risk_reason', '')}</p>
+          </td>
+          <td width="50%" style="background:#0a1a0a;border-radius:8px;padding:12px;vertical-align:top;">
+            <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#22c55e;">💎 WHY HIGH REWARD</p>
+            <p style="margin:0;font-size:13px;color:#86efac;line-height:1.5;">{idea.get('high_risk_reward', '')}</p>
+          </td>
+        </tr>
+        </table>"""
+
+    return f"""
+    <table width="100%" cellpadding="0" cellspacing="0" style="margin:20px 0;background:#1e1e32;border-radius:12px;border:1px solid {border_color};">
+    <tr><td style="padding:24px;">
+      <p style="margin:0;font-size:12px;font-weight:bold;color:{'#f59e0b' if is_hr else '#64748b'};text-transform:uppercase;letter-spacing:2px;">{label}</p>
+      <h2 style="margin:6px 0 0;font-size:22px;color:#e2e8f0;">{idea['business_name']}</h2>
+      <span style="background:#2d2d4a;color:#a78bfa;padding:3px 10px;border-radius:20px;font-size:11px;">{idea['category']}</span>
+
+      <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 What It Does</p>
+      <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['what_it_does']}</p>
+
+      <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 Where It Is Working</p>
+      <p style="margin:0;font-size:14px;color:#cbd5e1;">{idea['where_working']}</p>
+
+      <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 Why It Is Growing</p>
+      <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['why_growing']}</p>
+
+      <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 How To Adapt For Nepal</p>
+      <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['nepal_adaptation']}</p>
+
+      {hr_box}
+
+      <table width="100%" style="margin-top:16px;" cellpadding="0" cellspacing="0">
+      <tr>
+        <td width="50%">
+          <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;">🔹 Startup Cost</p>
+          <p style="margin:0;"><span style="background:{cost_color}22;color:{cost_color};padding:3px 10px;border-radius:8px;font-size:13px;font-weight:bold;">{idea['startup_cost']}</span>
+          <span style="color:#64748b;font-size:12px;margin-left:6px;">{idea.get('cost_estimate','')}</span></p>
+        </td>
+        <td width="50%">
+          <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;">🔹 Monetization</p>
+          <p style="margin:0;font-size:13px;color:#cbd5e1;">{idea['monetization']}</p>
+        </td>
+      </tr>
+      </table>
+
+      <p style="margin:16px 0 8px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 30-Day Action Plan</p>
+      <table width="100%" style="background:#15152a;border-radius:8px;" cellpadding="0" cellspacing="0">
+      {action_rows}
+      </table>
+    </td></tr>
+    </table>"""
+
+
+def build_detail_html(ideas: list, date_str: str) -> str:
+    ideas_html = "".join(render_detail_card(idea, idx) for idx, idea in enumerate(ideas, 1))
+
+    html = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1.0"></head>
+<body style="margin:0;padding:0;background:#0f0f1a;font-family:'Segoe UI',Tahoma,Geneva,Verdana,sans-serif;">
+
+<table width="100%" cellpadding="0" cellspacing="0" style="background:linear-gradient(135deg,#1a1a2e,#16213e,#0f3460);">
+<tr><td style="padding:30px 20px;text-align:center;">
+  <h1 style="margin:0;font-size:26px;color:#e94560;">📋 Full Breakdown — {len(ideas)} Idea{'s' if len(ideas) != 1 else ''}</h1>
+  <p style="margin:8px 0 0;font-size:14px;color:#a8b2d1;">{date_str}</p>
+  <p style="margin:6px 0 0;font-size:12px;color:#94a3b8;">Here are the detailed breakdowns you requested</p>
+</td></tr>
+</table>
+
+<table width="100%" cellpadding="0" cellspacing="0">
+<tr><td style="padding:0 20px 20px;">
+{ideas_html}
+</td></tr>
+</table>
+
+<table width="100%" cellpadding="0" cellspacing="0" style="background:#1a1a2e;">
+<tr><td style="padding:20px;text-align:center;">
+  <p style="margin:0;font-size:11px;color:#475569;">Business Automation System • Daily Ideas at 6:00 AM NPT</p>
+</td></tr>
+</table>
+
+</body></html>"""
+    return html
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Send / Reply Analytics
+Normalizes sends and reply requests into one append-only columnar event store
+(analytics/<YYYY-MM>/{day,kind,idea}.col, plus an idea-id dictionary) and
+answers the usual questions with whole-column aggregations.
+
+The sender and reply checker append events as they happen; "backfill"
+imports the sends already recorded in sent_history.json (both log shapes,
+names mapped back to ids).
+
+Usage:
+    python engagement_stats.py backfill
+    python engagement_stats.py categories [--kind requested] [--since 2026-01]
+    python engagement_stats.py repeats
+    python engagement_stats.py requests [--top 10]
+    python engagement_stats.py bench 10      # 10 synthetic years
+"""
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+import idea_shards
+import state_files
+
+BASE_DIR = Path(__file__).parent
+HISTORY_FILE = BASE_DIR / "sent_history.json"
+STORE_DIR = BASE_DIR / "analytics"
+
+EPOCH = date(1970, 1, 1)
+SENT, REQUESTED = 0, 1
+KINDS = {"sent": SENT, "requested": REQUESTED}
+# column name -> array typecode
+COLUMNS = {"day": "i", "kind": "B", "idea": "i"}
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+def save_json(fp, data):
+    with open(fp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def day_number(d):
+    return (d - EPOCH).days
+
+
+def day_date(n):
+    return EPOCH + timedelta(days=n)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  STORE
+# ═══════════════════════════════════════════════════════════════════════════
+def _dictionary_file(store):
+    return store / "ideas.json"
+
+
+def load_dictionary(store=None):
+    fp = _dictionary_file(store or STORE_DIR)
+    return load_json(fp)["ids"] if fp.exists() else []
+
+
+def _codes(idea_ids, store):
+    """Dictionary codes for idea ids, adding unseen ids."""
+    known = load_dictionary(store)
+    index = {idea_id: code for code, idea_id in enumerate(known)}
+    codes, added = [], False
+    for idea_id in idea_ids:
+        if idea_id not in index:
+            index[idea_id] = len(known)
+            known.append(idea_id)
+            added = True
+        codes.append(index[idea_id])
+    if added:
+        store.mkdir(parents=True, exist_ok=True)
+        save_json(_dictionary_file(store), {"ids": known})
+    return codes
+
+
+def append_events(kind, idea_ids, on=None, store=None):
+    """Append one event per idea id (kind: 'sent' or 'requested')."""
+    store = store or STORE_DIR
+    idea_ids = [i for i in idea_ids if i]
+    if not idea_ids:
+        return
+    on = on or date.today()
+    part = store / on.strftime("%Y-%m")
+    part.mkdir(parents=True, exist_ok=True)
+    n = len(idea_ids)
+    columns = {
+        "day": array("i", [day_number(on)] * n),
+        "kind": array("B", [KINDS[kind]] * n),
+        "idea": array("i", _codes(idea_ids, store)),
+    }
+    for name, col in columns.items():
+        with open(part / f"{name}.col", "ab") as f:
+            col.tofile(f)
+
+
+def partitions(store=None, since=None, until=None):
+    """Month partitions within [since, until] ('YYYY-MM'), oldest first."""
+    store = store or STORE_DIR
+    if not store.exists():
+        return []
+    return [
+        p for p in sorted(store.iterdir())
+        if p.is_dir() and (not since or p.name >= since) and (not until or p.name <= until)
+    ]
+
+
+def read_columns(store=None, since=None, until=None):
+    """Concatenated day/kind/idea columns over the selected partitions."""
+    out = {name: array(code) for name, code in COLUMNS.items()}
+    for part in partitions(store, since, until):
+        sizes = {}
+        for name, code in COLUMNS.items():
+            fp = part / f"{name}.col"
+            col = array(code)
+            if fp.exists():
+                col.frombytes(fp.read_bytes())
+            sizes[name] = len(col)
+            out[name].extend(col)
+        # A crash mid-append can leave one column longer; keep complete rows only
+        rows = min(sizes.values())
+        for name in COLUMNS:
+            extra = sizes[name] - rows
+            if extra:
+                del out[name][len(out[name]) - extra:]
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BACKFILL
+# ═══════════════════════════════════════════════════════════════════════════
+def history_sends(history, ideas):
+    """(date, [idea ids]) per sent_history log entry; names mapped to ids."""
+    by_name = {i["business_name"]: i["id"] for i in ideas}
+    sends, unknown = [], set()
+    for entry in history.get("log", []):
+        on = date.fromisoformat(entry["date"])
+        if "ids" in entry:
+            ids = list(entry["ids"])
+        else:
+            names = list(entry.get("ideas", [])) + list(entry.get("main", [])) + list(entry.get("bonus", []))
+            if entry.get("high_risk"):
+                names.append(entry["high_risk"])
+            ids = []
+            for name in names:
+                if name in by_name:
+                    ids.append(by_name[name])
+                else:
+                    unknown.add(name)
+        sends.append((on, ids))
+    return sends, sorted(unknown)
+
+
+def backfill(history, ideas, store=None):
+    """Replace all 'sent' events with those in sent_history.json; keeps reply events."""
+    store = store or STORE_DIR
+    cols = read_columns(store)
+    kept = [(day_date(d), i) for d, k, i in zip(cols["day"], cols["kind"], cols["idea"]) if k != SENT]
+    dictionary = load_dictionary(store)
+
+    for part in partitions(store):
+        shutil.rmtree(part)
+
+    sends, unknown = history_sends(history, ideas)
+    for on, ids in sends:
+        append_events("sent", ids, on, store)
+    requests_by_day = {}
+    for on, code in kept:
+        requests_by_day.setdefault(on, []).append(dictionary[code])
+    for on, ids in sorted(requests_by_day.items()):
+        append_events("requested", ids, on, store)
+    return sum(len(ids) for _, ids in sends), len(kept), unknown
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  AGGREGATIONS
+# ═══════════════════════════════════════════════════════════════════════════
+def category_distribution(cols, categories, kind=SENT):
+    """Category -> event count for one event kind."""
+    counts = Counter(i for i, k in zip(cols["idea"], cols["kind"]) if k == kind)
+    by_category = Counter()
+    for code, n in counts.items():
+        by_category[categories[code]] += n
+    return by_category
+
+
+def repeat_intervals(cols):
+    """Days between consecutive sends of the same idea (all ideas pooled)."""
+    last, gaps = {}, []
+    order = sorted(range(len(cols["day"])), key=cols["day"].__getitem__)
+    day, kind, idea = cols["day"], cols["kind"], cols["idea"]
+    for r in order:
+        if kind[r] != SENT:
+            continue
+        prev = last.get(idea[r])
+        if prev is not None:
+            gaps.append(day[r] - prev)
+        last[idea[r]] = day[r]
+    return gaps
+
+
+def request_rates(cols):
+    """Idea code -> (sends, requests)."""
+    sends = Counter(i for i, k in zip(cols["idea"], cols["kind"]) if k == SENT)
+    requests = Counter(i for i, k in zip(cols["idea"], cols["kind"]) if k == REQUESTED)
+    return {code: (sends[code], requests[code]) for code in sends.keys() | requests.keys()}
+
+
+def category_lookup(dictionary, ideas):
+    cat = {i["id"]: i["category"] for i in ideas}
+    return [cat.get(idea_id, "(removed)") for idea_id in dictionary]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+def benchmark(years, ideas):
+    store = BASE_DIR / "bench_analytics"
+    shutil.rmtree(store, ignore_errors=True)
+    rng = random.Random(3)
+    ids = [i["id"] for i in ideas]
+    start = date.today() - timedelta(days=365 * years)
+    try:
+        for d in range(365 * years):
+            on = start + timedelta(days=d)
+            append_events("sent", rng.sample(ids, 3), on, store)
+            append_events("sent", rng.sample(ids, 3), on, store)
+            if rng.random() < 0.6:
+                append_events("requested", rng.sample(ids, rng.randint(1, 3)), on, store)
+        t0 = time.perf_counter()
+        cols = read_columns(store)
+        categories = category_lookup(load_dictionary(store), ideas)
+        category_distribution(cols, categories)
+        category_distribution(cols, categories, REQUESTED)
+        repeat_intervals(cols)
+        request_rates(cols)
+        elapsed = time.perf_counter() - t0
+        print(f"📊 {years} years, {len(cols['day']):,} events: all aggregations in {elapsed * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(store, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Analytics over sends and reply requests.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("backfill")
+    for name in ("categories", "repeats", "requests"):
+        p = sub.add_parser(name)
+        p.add_argument("--since", help="first month, YYYY-MM")
+        p.add_argument("--until", help="last month, YYYY-MM")
+        if name == "categories":
+            p.add_argument("--kind", choices=sorted(KINDS), default="sent")
+        if name == "requests":
+            p.add_argument("--top", type=int, default=10)
+    p_bench = sub.add_parser("bench")
+    p_bench.add_argument("years", type=int, nargs="?", default=10)
+    args = parser.parse_args()
+
+    ideas = idea_shards.load_ideas()
+
+    if args.cmd == "backfill":
+        # Rewrites every partition; briefings and reply checks append under the same lock
+        with state_files.state_lock():
+            history = load_json(HISTORY_FILE) if HISTORY_FILE.exists() else {}
+            sent, kept, unknown = backfill(history, ideas)
+        print(f"✅ Imported {sent} sends from history ({kept} reply requests kept)")
+        for name in unknown:
+            print(f"⚠ Not in catalogue, skipped: {name}")
+        return
+    if args.cmd == "bench":
+        benchmark(args.years, ideas)
+        return
+
+    cols = read_columns(since=args.since, until=args.until)
+    if not cols["day"]:
+        print("ℹ No events yet — run 'python engagement_stats.py backfill' first.")
+        sys.exit(1)
+    dictionary = load_dictionary()
+    names = {i["id"]: i["business_name"] for i in ideas}
+
+    if args.cmd == "categories":
+        dist = category_distribution(cols, category_lookup(dictionary, ideas), KINDS[args.kind])
+        total = sum(dist.values()) or 1
+        for category, n in dist.most_common():
+            print(f"   {n:6d}  {n * 100 / total:5.1f}%  {category}")
+    elif args.cmd == "repeats":
+        gaps = repeat_intervals(cols)
+        sends = sum(1 for k in cols["kind"] if k == SENT)
+        if not gaps:
+            print(f"   {sends} sends, no idea sent twice yet")
+            return
+        print(f"   {sends} sends, {len(gaps)} repeats ({len(gaps) * 100 / sends:.1f}%)")
+        print(f"   days between repeats: min {min(gaps)}, median {statistics.median(gaps):g}, "
+              f"mean {statistics.fmean(gaps):.1f}, max {max(gaps)}")
+    elif args.cmd == "requests":
+        rates = request_rates(cols)
+        ranked = sorted(rates.items(), key=lambda kv: (-kv[1][1], -kv[1][0]))[:args.top]
+        for code, (sent, requested) in ranked:
+            rate = f"{requested / sent:5.2f}" if sent else "   — "
+            idea_id = dictionary[code]
+            print(f"   {requested:4d} req / {sent:4d} sent  {rate}  {names.get(idea_id, idea_id)}")
+
+
+if __name__ == "__main__":
+    main()
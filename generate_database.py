@@ -1,6 +1,8 @@
 """Run this once to generate ideas_database.json"""
 import json
 
+import derived_fields
+
 ideas = [
 # ──── AI TOOLS ────
 {"id":"ai01","business_name":"ResumeKraft AI","category":"AI Tools","is_high_risk":False,
@@ -330,6 +332,9 @@ ideas = [
 "action_plan":["Day 1-7: Collect 1000+ crop disease photos from Nepali farms (field visits)","Day 8-14: Train disease detection AI model on Nepal-specific crops","Day 15-20: Build farmer-friendly mobile app with Nepali voice guidance","Day 21-25: Field test with 50 farmers in Chitwan/Kavre districts","Day 26-30: Partner with 3 agro-vet companies for treatment recommendations"]}
 ]
 
+# Display fields the email renderers read (first sentences, MVP steps, colours)
+derived_fields.refresh(ideas)
+
 with open("ideas_database.json", "w", encoding="utf-8") as f:
     json.dump(ideas, f, indent=2, ensure_ascii=False)
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Constrained Idea Selection
+Picks the daily ideas from indexed unsent pools, one pool per
+(priority, category, startup cost, high-risk) combination, so the variety
+rules are checked once per pool instead of once per idea. Rules come from
+config.json (defaults shown):
+
+    "selection": {"unique_categories": true, "max_high_risk": 1, "mix_costs": true}
+
+- unique_categories: no two ideas from the same category
+- max_high_risk:     at most this many is_high_risk ideas (null = no limit)
+- mix_costs:         spread picks evenly over the startup_cost tiers available
+
+Each pick costs O(pools), i.e. O(categories); a briefing O(k · categories).
+The pools are built once per catalogue and then follow sent_history.json
+incrementally, so the resident scheduler doesn't rescan the catalogue between
+runs. Priority ideas still go first (within the rules), and the history still
+resets when fewer than k unsent ideas remain. If the hard rules can't be met,
+the fewest of them are dropped (max_high_risk first, then unique_categories)
+for the remaining picks, and the sender logs which.
+
+Usage:
+    python idea_selection.py              # dry run: pick today's ideas, send nothing
+    python idea_selection.py 5
+"""
+
+import json
+import logging
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import idea_shards
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+HISTORY_FILE = BASE_DIR / "sent_history.json"
+
+DEFAULT_CONSTRAINTS = {"unique_categories": True, "max_high_risk": 1, "mix_costs": True}
+RELAX_ORDER = ("max_high_risk", "unique_categories")
+RULE_OFF = {"max_high_risk": None, "unique_categories": False}
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def load_constraints(config):
+    rules = dict(DEFAULT_CONSTRAINTS)
+    rules.update(config.get("selection") or {})
+    return rules
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  POOLS
+# ═══════════════════════════════════════════════════════════════════════════
+def pool_key(idea):
+    return (idea.get("priority") is True, idea.get("category", ""),
+            idea.get("startup_cost"), bool(idea.get("is_high_risk")))
+
+
+class IdeaPools:
+    """Unsent ideas bucketed by pool_key(), with O(1) removal by id."""
+
+    def __init__(self, ideas):
+        self.ideas = ideas
+        self.size = len(ideas)
+        self.pools = {}         # pool key -> [position in ideas]
+        self.where = {}         # idea id -> (pool key, slot in that pool)
+        self.synced = 0         # how many sent_ids entries have been applied
+        self.last_synced = None
+        self.reset()
+
+    def reset(self):
+        """Every idea unsent again."""
+        self.pools.clear()
+        self.where.clear()
+        for n in range(len(self.ideas)):
+            self._add(n)
+        self.synced, self.last_synced = 0, None
+
+    def __len__(self):
+        return len(self.where)
+
+    def _add(self, n):
+        key = pool_key(self.ideas[n])
+        pool = self.pools.setdefault(key, [])
+        self.where[self.ideas[n]["id"]] = (key, len(pool))
+        pool.append(n)
+
+    def _remove(self, idea_id):
+        key, slot = self.where.pop(idea_id)
+        pool = self.pools[key]
+        moved = pool.pop()
+        if slot < len(pool):
+            pool[slot] = moved
+            self.where[self.ideas[moved]["id"]] = (key, slot)
+        if not pool:
+            del self.pools[key]
+
+    def _pick(self, n):
+        """Take the idea at position n out of its pool; returns its record."""
+        idea = self.ideas[n]
+        self._remove(idea["id"])
+        return idea
+
+    def discard(self, idea_id):
+        if idea_id in self.where:
+            self._remove(idea_id)
+
+    def sync(self, sent_ids):
+        """Follow history["sent_ids"]: apply only new entries when it grew, else rebuild."""
+        n = self.synced
+        if len(sent_ids) >= n and (n == 0 or sent_ids[n - 1] == self.last_synced):
+            new = sent_ids[n:]
+        else:
+            self.reset()
+            new = sent_ids
+        for idea_id in new:
+            self.discard(idea_id)
+        self.synced = len(sent_ids)
+        self.last_synced = sent_ids[-1] if sent_ids else None
+
+    # ─── Picking ─────────────────────────────────────────────────────────
+    def _candidates(self, rules, categories, high_risk, costs):
+        limit = rules.get("max_high_risk")
+        keys = [
+            key for key in self.pools
+            if not (rules.get("unique_categories") and key[1] in categories)
+            and not (limit is not None and key[3] and high_risk >= limit)
+        ]
+        if any(key[0] for key in keys):
+            keys = [key for key in keys if key[0]]
+        if rules.get("mix_costs") and keys:
+            fewest = min(costs[key[2]] for key in keys)
+            keys = [key for key in keys if costs[key[2]] == fewest]
+        return keys
+
+    def select(self, count, rules=None, rng=random):
+        """Up to `count` unsent ideas satisfying rules; returns (ideas, relaxed rule names).
+
+        Pools are left as they were — ideas only leave them via sync()/discard().
+        """
+        rules = dict(rules or {})
+        chosen, picked, relaxed = [], [], []
+        categories, costs, high_risk = set(), Counter(), 0
+        while len(chosen) < count and self.pools:
+            keys = self._candidates(rules, categories, high_risk, costs)
+            if not keys:
+                # Drop as few rules as possible: one at a time in RELAX_ORDER, then all of them
+                active = [r for r in RELAX_ORDER if rules.get(r) not in (None, False)]
+                for drop in [[r] for r in active] + [active]:
+                    trial = dict(rules, **{r: RULE_OFF[r] for r in drop})
+                    keys = self._candidates(trial, categories, high_risk, costs)
+                    if keys:
+                        break
+                if not keys:
+                    break
+                rules = trial
+                relaxed.extend(drop)
+            # Pool chosen in proportion to its size: every candidate idea is equally likely
+            at = rng.randrange(sum(len(self.pools[key]) for key in keys))
+            for key in keys:
+                if at < len(self.pools[key]):
+                    break
+                at -= len(self.pools[key])
+            n = self.pools[key][at]
+            chosen.append(self._pick(n))
+            picked.append(n)
+            categories.add(key[1])
+            costs[key[2]] += 1
+            high_risk += key[3]
+        for n in picked:
+            self._add(n)
+        rng.shuffle(chosen)
+        return chosen, relaxed
+
+
+_pools = None
+
+
+def pools_for(ideas, sent_ids):
+    """IdeaPools for this catalogue, reused across runs while the catalogue is unchanged.
+
+    idea_shards.catalogue_index() returns the same list object until the data
+    changes, so a resident process only rebuilds after an ingest.
+    """
+    global _pools
+    if _pools is None or _pools.ideas is not ideas or _pools.size != len(ideas):
+        _pools = IdeaPools(ideas)
+    _pools.sync(sent_ids)
+    return _pools
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    config = load_json(CONFIG_FILE) if CONFIG_FILE.exists() else {}
+    history = load_json(HISTORY_FILE) if HISTORY_FILE.exists() else {"sent_ids": []}
+    rules = load_constraints(config)
+
+    pools = pools_for(idea_shards.catalogue_index(), history.get("sent_ids", []))
+    if len(pools) < count:
+        print(f"ℹ Only {len(pools)} unsent ideas — the next briefing will reset the history.")
+        pools.reset()
+    chosen, relaxed = pools.select(count, rules)
+    print(f"📊 {len(pools)} unsent ideas in {len(pools.pools)} pools; rules {rules}")
+    for idea in chosen:
+        flags = " 🔥" if idea.get("is_high_risk") else ""
+        print(f"   {idea['id']:<10} {idea.get('startup_cost') or '—':<7} {idea['category']}{flags}")
+    if relaxed:
+        print(f"⚠ Relaxed: {', '.join(relaxed)}")
+
+
+if __name__ == "__main__":
+    main()
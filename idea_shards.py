@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Category-Sharded Database
+Stores the catalogue as one JSON file per category under ideas_shards/, plus a
+manifest with per-shard counts, checksums, ids and unsent counts. Selection
+runs on the manifest alone and only the shards holding the chosen ideas are
+read. Without a manifest everything falls back to ideas_database.json.
+
+Usage:
+    python idea_shards.py split     # ideas_database.json -> ideas_shards/
+    python idea_shards.py status    # per-category counts / unsent
+    python idea_shards.py verify    # check shard checksums (e.g. after a sync)
+"""
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+import state_files
+
+BASE_DIR = Path(__file__).parent
+IDEAS_FILE = BASE_DIR / "ideas_database.json"
+HISTORY_FILE = BASE_DIR / "sent_history.json"
+SHARDS_DIR = BASE_DIR / "ideas_shards"
+MANIFEST_FILE = SHARDS_DIR / "manifest.json"
+
+MANIFEST_VERSION = 2     # 2: per-shard high_risk_ids / cost_ids for constrained selection
+
+_index = {}             # shard checksums -> catalogue_index() stubs
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+def save_json(fp, data):
+    tmp = fp.with_name(fp.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp.replace(fp)
+
+
+def shard_name(category):
+    return (re.sub(r"[^a-z0-9]+", "-", category.lower()).strip("-") or "uncategorized") + ".json"
+
+
+def is_sharded():
+    return MANIFEST_FILE.exists()
+
+
+def load_manifest():
+    if not is_sharded():
+        return {"version": MANIFEST_VERSION, "shards": {}}
+    return load_json(MANIFEST_FILE)
+
+
+def _read_manifest():
+    """Cached manifest for read-only callers."""
+    return state_files.load_cached(MANIFEST_FILE)
+
+
+def _checksum(fp):
+    return hashlib.sha256(fp.read_bytes()).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  WRITE
+# ═══════════════════════════════════════════════════════════════════════════
+def write_shards(by_category, sent_ids=()):
+    """Rewrite the given {category: [ideas]} shards and their manifest entries.
+
+    Shards not named in by_category are left untouched.
+    """
+    SHARDS_DIR.mkdir(exist_ok=True)
+    manifest = load_manifest()
+    sent = set(sent_ids)
+    for category, ideas in by_category.items():
+        fp = SHARDS_DIR / shard_name(category)
+        save_json(fp, ideas)
+        manifest["shards"][category] = {
+            "file": fp.name,
+            "count": len(ideas),
+            "sha256": _checksum(fp),
+            "ids": [i["id"] for i in ideas],
+            "priority_ids": [i["id"] for i in ideas if i.get("priority") is True],
+            "high_risk_ids": [i["id"] for i in ideas if i.get("is_high_risk")],
+            "cost_ids": _cost_ids(ideas),
+            "unsent": sum(1 for i in ideas if i["id"] not in sent),
+        }
+    # Untouched shards of an older manifest keep their old entries until a full split
+    if all("cost_ids" in entry for entry in manifest["shards"].values()):
+        manifest["version"] = MANIFEST_VERSION
+    save_json(MANIFEST_FILE, manifest)
+    return manifest
+
+
+def _cost_ids(ideas):
+    by_cost = {}
+    for i in ideas:
+        by_cost.setdefault(i.get("startup_cost") or "", []).append(i["id"])
+    return by_cost
+
+
+def split_database(ideas, sent_ids=()):
+    """Shard a full catalogue (one-off migration from ideas_database.json)."""
+    by_category = {}
+    for idea in ideas:
+        by_category.setdefault(idea["category"], []).append(idea)
+    return write_shards(by_category, sent_ids)
+
+
+def add_ideas(new_ideas, sent_ids=()):
+    """Append ideas, rewriting only the shards of their categories."""
+    manifest = load_manifest()
+    touched = {}
+    for idea in new_ideas:
+        cat = idea["category"]
+        if cat not in touched:
+            entry = manifest["shards"].get(cat)
+            touched[cat] = load_json(SHARDS_DIR / entry["file"]) if entry else []
+        touched[cat].append(idea)
+    if touched:
+        write_shards(touched, sent_ids)
+    return sorted(touched)
+
+
+def update_unsent(sent_ids):
+    """Refresh the per-shard unsent counts after a send (manifest only)."""
+    if not is_sharded():
+        return
+    manifest = load_manifest()
+    sent = set(sent_ids)
+    for entry in manifest["shards"].values():
+        entry["unsent"] = sum(1 for i in entry["ids"] if i not in sent)
+    save_json(MANIFEST_FILE, manifest)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  READ
+# ═══════════════════════════════════════════════════════════════════════════
+def load_shard(category, manifest=None):
+    """Records of one shard (cached; don't mutate)."""
+    manifest = manifest or _read_manifest()
+    entry = manifest["shards"].get(category)
+    return state_files.load_cached(SHARDS_DIR / entry["file"]) if entry else []
+
+
+def load_ideas(categories=None):
+    """Full records for the given categories (all if None)."""
+    if not is_sharded():
+        ideas = state_files.load_cached(IDEAS_FILE)
+        return list(ideas) if categories is None else [i for i in ideas if i["category"] in categories]
+    manifest = _read_manifest()
+    wanted = manifest["shards"] if categories is None else [c for c in categories if c in manifest["shards"]]
+    ideas = []
+    for category in wanted:
+        ideas.extend(load_shard(category, manifest))
+    return ideas
+
+
+def all_ids():
+    if not is_sharded():
+        return {i["id"] for i in state_files.load_cached(IDEAS_FILE)}
+    return {i for entry in _read_manifest()["shards"].values() for i in entry["ids"]}
+
+
+def catalogue_index():
+    """Records select_ideas can run on: manifest stubs when sharded, full records otherwise.
+
+    The same list object is returned until the catalogue changes, so callers
+    can keep indexes over it (see idea_selection.pools_for).
+    """
+    if not is_sharded():
+        return state_files.load_cached(IDEAS_FILE)
+    shards = _read_manifest()["shards"]
+    # Sends rewrite the manifest (unsent counts); only shard content changes invalidate
+    key = tuple((category, entry["sha256"]) for category, entry in shards.items())
+    if key in _index:
+        return _index[key]
+    stubs = []
+    for category, entry in shards.items():
+        priority = set(entry.get("priority_ids", []))
+        high_risk = set(entry.get("high_risk_ids", []))
+        cost = {i: c or None for c, ids in entry.get("cost_ids", {}).items() for i in ids}
+        stubs.extend({"id": i, "category": category, "priority": i in priority,
+                      "is_high_risk": i in high_risk, "startup_cost": cost.get(i)} for i in entry["ids"])
+    _index.clear()
+    _index[key] = stubs
+    return stubs
+
+
+def fetch(selected):
+    """Full records for catalogue_index() entries, in order, reading only their shards."""
+    if not is_sharded():
+        return selected
+    manifest = _read_manifest()
+    records = {}
+    for category in {s["category"] for s in selected}:
+        records.update((i["id"], i) for i in load_shard(category, manifest))
+    return [records[s["id"]] for s in selected if s["id"] in records]
+
+
+def fetch_ids(ids):
+    """Full records for these ids, in order, reading only the shards that hold them."""
+    wanted = set(ids)
+    if not is_sharded():
+        by_id = {i["id"]: i for i in state_files.load_cached(IDEAS_FILE) if i["id"] in wanted}
+    else:
+        manifest = _read_manifest()
+        by_id = {}
+        for category, entry in manifest["shards"].items():
+            if not wanted.isdisjoint(entry["ids"]):
+                by_id.update((i["id"], i) for i in load_shard(category, manifest) if i["id"] in wanted)
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def verify():
+    """Names of shards whose checksum doesn't match the manifest (or are missing)."""
+    bad = []
+    for category, entry in load_manifest()["shards"].items():
+        fp = SHARDS_DIR / entry["file"]
+        if not fp.exists() or _checksum(fp) != entry["sha256"]:
+            bad.append(entry["file"])
+    return bad
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if cmd == "split":
+        with state_files.state_lock():
+            history = load_json(HISTORY_FILE) if HISTORY_FILE.exists() else {"sent_ids": []}
+            manifest = split_database(load_json(IDEAS_FILE), history.get("sent_ids", []))
+        print(f"✅ Wrote {len(manifest['shards'])} shards to {SHARDS_DIR.name}/")
+    elif cmd == "status":
+        if not is_sharded():
+            print("ℹ Not sharded — run 'python idea_shards.py split' first.")
+            return
+        manifest = load_manifest()
+        if manifest.get("version", 1) < MANIFEST_VERSION:
+            print("ℹ Manifest predates cost/risk flags — run 'python idea_shards.py split' to refresh it.")
+        for category, entry in sorted(manifest["shards"].items()):
+            print(f"   {entry['count']:5d} ideas  {entry['unsent']:5d} unsent  {category}  ({entry['file']})")
+    elif cmd == "verify":
+        bad = verify()
+        for name in bad:
+            print(f"❌ Checksum mismatch: {name}")
+        if bad:
+            sys.exit(1)
+        print("✅ All shards match the manifest")
+    else:
+        print(f"❌ Unknown command: {cmd} (use split, status or verify)")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Read-Only Catalogue API
+A small HTTP service over the catalogue and send history, so nobody has to
+copy ideas_database.json / sent_history.json around to browse ideas.
+
+    GET /ideas?category=…&cost=low|medium|high&risk=high|normal&sent=yes|no&page=1&per_page=20
+    GET /ideas/<id>               full record (+ "sent")
+    GET /ideas/<id>/preview       the card as rendered in the detail email (HTML)
+    GET /categories               idea and unsent counts per category
+    GET /history?limit=20         latest send log entries
+
+Every response carries an ETag and honours If-None-Match. Rendered responses
+are kept in an in-process cache that is dropped as soon as the database,
+shard manifest or history file changes on disk; if one can't be read (caught
+mid-rewrite) the request gets a 500 and nothing is cached. Binds to localhost
+by default; it never writes state.
+
+Usage:
+    python ideas_api.py                          # http://127.0.0.1:8765
+    python ideas_api.py --host 0.0.0.0 --port 9000
+"""
+
+import argparse
+import hashlib
+import json
+import socket
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import detail_cards
+import idea_shards
+import state_files
+
+BASE_DIR = Path(__file__).parent
+HISTORY_FILE = BASE_DIR / "sent_history.json"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+MAX_CACHED = 2048
+SUMMARY_FIELDS = ("id", "business_name", "category", "startup_cost", "cost_estimate", "is_high_risk")
+
+
+class BadRequest(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CATALOGUE SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════
+def data_version():
+    """Changes whenever any file the API serves from is rewritten."""
+    files = [idea_shards.MANIFEST_FILE if idea_shards.is_sharded() else idea_shards.IDEAS_FILE, HISTORY_FILE]
+    stamp = []
+    for fp in files:
+        try:
+            st = fp.stat()
+            stamp.append((str(fp), st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append((str(fp), None, None))
+    # Previews carry the date, so they go stale at midnight too
+    return tuple(stamp), datetime.now().strftime("%Y-%m-%d")
+
+
+class Catalogue:
+    """Ideas, history and indexes for one data_version()."""
+
+    def __init__(self, version):
+        self.version = version
+        self.ideas = idea_shards.load_ideas()
+        self.by_id = {i["id"]: i for i in self.ideas}
+        self.history = state_files.load_cached(HISTORY_FILE) if HISTORY_FILE.exists() else {}
+        self.sent = set(self.history.get("sent_ids", []))
+
+
+class ResponseCache:
+    """Rendered (etag, content type, body) per request target, for one catalogue version."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.catalogue = None
+        self.responses = {}
+
+    def current(self):
+        version = data_version()
+        with self.lock:
+            if version == self.version:
+                return self.catalogue
+        catalogue = Catalogue(version)
+        with self.lock:
+            self.version, self.catalogue, self.responses = version, catalogue, {}
+        return catalogue
+
+    def get(self, target):
+        catalogue = self.current()
+        with self.lock:
+            hit = self.responses.get(target)
+        if hit:
+            return hit
+        content_type, body = render(catalogue, target)
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        entry = (etag, content_type, body)
+        with self.lock:
+            if self.catalogue is catalogue:
+                if len(self.responses) >= MAX_CACHED:
+                    self.responses.pop(next(iter(self.responses)))
+                self.responses[target] = entry
+        return entry
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ROUTES
+# ═══════════════════════════════════════════════════════════════════════════
+def _json(data):
+    return "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _int_param(params, name, default, lo, hi):
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if not lo <= value <= hi:
+        raise BadRequest(f"{name} must be between {lo} and {hi}")
+    return value
+
+
+def _yes_no(params, name, yes, no):
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return None
+    raw = raw.lower()
+    if raw not in (yes, no):
+        raise BadRequest(f"{name} must be '{yes}' or '{no}'")
+    return raw == yes
+
+
+def list_ideas(catalogue, params):
+    category = params.get("category", [None])[0]
+    cost = params.get("cost", [None])[0]
+    high_risk = _yes_no(params, "risk", "high", "normal")
+    sent = _yes_no(params, "sent", "yes", "no")
+    per_page = _int_param(params, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    page = _int_param(params, "page", 1, 1, 10 ** 6)
+
+    matches = [
+        i for i in catalogue.ideas
+        if (category is None or i["category"].lower() == category.lower())
+        and (cost is None or str(i.get("startup_cost", "")).lower() == cost.lower())
+        and (high_risk is None or bool(i.get("is_high_risk")) == high_risk)
+        and (sent is None or (i["id"] in catalogue.sent) == sent)
+    ]
+    start = (page - 1) * per_page
+    return {
+        "total": len(matches),
+        "page": page,
+        "per_page": per_page,
+        "pages": (len(matches) + per_page - 1) // per_page,
+        "ideas": [
+            dict({f: i.get(f) for f in SUMMARY_FIELDS}, sent=i["id"] in catalogue.sent)
+            for i in matches[start:start + per_page]
+        ],
+    }
+
+
+def category_counts(catalogue):
+    counts = {}
+    for i in catalogue.ideas:
+        entry = counts.setdefault(i["category"], {"category": i["category"], "ideas": 0, "unsent": 0})
+        entry["ideas"] += 1
+        entry["unsent"] += i["id"] not in catalogue.sent
+    return sorted(counts.values(), key=lambda c: c["category"])
+
+
+def render(catalogue, target):
+    """(content type, body bytes) for a GET target; raises BadRequest / NotFound."""
+    url = urlsplit(target)
+    params = parse_qs(url.query)
+    parts = [p for p in url.path.split("/") if p]
+
+    if parts == ["ideas"]:
+        return _json(list_ideas(catalogue, params))
+    if len(parts) in (2, 3) and parts[0] == "ideas":
+        idea = catalogue.by_id.get(parts[1])
+        if idea is None:
+            raise NotFound(f"no idea with id {parts[1]!r}")
+        if len(parts) == 2:
+            return _json(dict(idea, sent=idea["id"] in catalogue.sent))
+        if parts[2] == "preview":
+            html = detail_cards.build_detail_html([idea], catalogue.version[1])
+            return "text/html; charset=utf-8", html.encode("utf-8")
+    if parts == ["categories"]:
+        return _json(category_counts(catalogue))
+    if parts == ["history"]:
+        limit = _int_param(params, "limit", 20, 1, 1000)
+        return _json(catalogue.history.get("log", [])[-limit:][::-1])
+    raise NotFound(f"unknown path {url.path}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SERVER
+# ═══════════════════════════════════════════════════════════════════════════
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive; every response has a Content-Length
+    server_version = "DailyIdeasAPI/1.0"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send(self, status, content_type, body, etag=None, head=False):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head and status != 304:
+            self.wfile.write(body)
+
+    def do_GET(self, head=False):
+        try:
+            etag, content_type, body = self.server.cache.get(self.path)
+        except BadRequest as e:
+            self._send(400, *_json({"error": str(e)}), head=head)
+            return
+        except NotFound as e:
+            self._send(404, *_json({"error": str(e)}), head=head)
+            return
+        except Exception as e:
+            # e.g. a state file caught mid-rewrite; nothing was cached, the next request reads it again
+            self.log_error("%s failed: %s: %s", self.path, type(e).__name__, e)
+            self._send(500, *_json({"error": "catalogue temporarily unreadable, retry"}), head=head)
+            return
+        inm = self.headers.get("If-None-Match", "")
+        if inm and (inm.strip() == "*" or etag in (t.strip() for t in inm.split(","))):
+            self._send(304, content_type, b"", etag)
+        else:
+            self._send(200, content_type, body, etag, head)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        super().log_message(format, *args)     # errors are logged even without --verbose
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, verbose=False):
+        super().__init__(address, ApiHandler)
+        self.cache = ResponseCache()
+        self.verbose = verbose
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the ideas catalogue over read-only HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = ApiServer((args.host, args.port), args.verbose)
+    print(f"✅ Serving ideas on http://{args.host}:{server.server_address[1]}/ideas  (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Shared SMTP / IMAP Connections
+One place that opens, reuses and times mail connections for both the sender
+and the reply checker. Logged-in connections are pooled per server/account
+and health-checked with NOOP before reuse. TLS sessions are kept per server
+and offered on the next handshake, so reconnects resume instead of doing a
+full handshake. Every new connection records connect / handshake / login
+timings.
+
+Note: Python's ssl module cannot serialize SSLSession objects, so sessions
+live for the process lifetime — in the resident scheduler that spans all
+ticks; one-shot script runs start cold.
+
+Usage:
+    python mail_connections.py      # open SMTP + IMAP twice and print timings
+"""
+
+import atexit
+import imaplib
+import json
+import logging
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+
+DEFAULT_IMAP_SERVER = "imap.gmail.com"
+DEFAULT_IMAP_PORT = 993
+MAX_IDLE = 600          # seconds; older idle connections are closed, not NOOP-probed
+TIMEOUT = 30
+MAX_TIMINGS = 100
+
+log = logging.getLogger("mail_connections")
+
+_context = ssl.create_default_context()
+_lock = threading.Lock()
+_sessions = {}          # (host, port) -> ssl.SSLSession
+_idle = {}              # pool key -> [(conn, last_used)]
+_timings = []
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class _ResumingContext:
+    """SSLContext stand-in that offers the cached session and times the handshake."""
+
+    def __init__(self, host, port, timing):
+        self.key = (host, port)
+        self.timing = timing
+
+    def wrap_socket(self, sock, **kwargs):
+        session = _sessions.get(self.key)
+        if session is not None:
+            kwargs["session"] = session
+        started = time.perf_counter()
+        tls = _context.wrap_socket(sock, **kwargs)
+        self.timing["handshake_ms"] = _ms(time.perf_counter() - started)
+        self.timing["resumed"] = tls.session_reused
+        return tls
+
+
+def _remember_session(host, port, sock):
+    session = getattr(sock, "session", None)
+    if session is not None:
+        _sessions[(host, port)] = session
+
+
+def _record(timing):
+    with _lock:
+        _timings.append(timing)
+        del _timings[:-MAX_TIMINGS]
+    log.info(
+        "🔌 %s %s: connect %.0f ms, TLS %.0f ms%s, login %.0f ms",
+        timing["protocol"].upper(), timing["host"], timing["connect_ms"], timing["handshake_ms"],
+        " (resumed)" if timing["resumed"] else "", timing["auth_ms"],
+    )
+
+
+def timings():
+    """Timings of the most recent new connections (oldest first)."""
+    with _lock:
+        return list(_timings)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  OPEN / CLOSE
+# ═══════════════════════════════════════════════════════════════════════════
+def _open_smtp(config):
+    host, port = config["smtp_server"], config["smtp_port"]
+    timing = {"protocol": "smtp", "host": host, "handshake_ms": 0.0, "resumed": False}
+    started = time.perf_counter()
+    s = smtplib.SMTP(host, port, timeout=TIMEOUT)
+    timing["connect_ms"] = _ms(time.perf_counter() - started)
+    if config.get("smtp_starttls", True):
+        s.ehlo()
+        s.starttls(context=_ResumingContext(host, port, timing))
+    s.ehlo()
+    started = time.perf_counter()
+    s.login(config["sender_email"], config["sender_password"])
+    timing["auth_ms"] = _ms(time.perf_counter() - started)
+    _record(timing)
+    return s
+
+
+def _open_imap(config):
+    host = config.get("imap_server", DEFAULT_IMAP_SERVER)
+    port = config.get("imap_port", DEFAULT_IMAP_PORT)
+    timing = {"protocol": "imap", "host": host, "handshake_ms": 0.0, "resumed": False}
+    started = time.perf_counter()
+    mail = imaplib.IMAP4_SSL(host, port, ssl_context=_ResumingContext(host, port, timing), timeout=TIMEOUT)
+    timing["connect_ms"] = _ms(time.perf_counter() - started) - timing["handshake_ms"]
+    started = time.perf_counter()
+    mail.login(config["sender_email"], config["sender_password"])
+    timing["auth_ms"] = _ms(time.perf_counter() - started)
+    _record(timing)
+    return mail
+
+
+def _alive(protocol, conn):
+    try:
+        if protocol == "smtp":
+            return conn.noop()[0] == 250
+        return conn.noop()[0] == "OK"
+    except (OSError, imaplib.IMAP4.error, smtplib.SMTPException):
+        return False
+
+
+def _close(protocol, conn):
+    try:
+        if protocol == "smtp":
+            conn.quit()
+        else:
+            conn.logout()
+    except (OSError, imaplib.IMAP4.error, smtplib.SMTPException):
+        pass
+
+
+def _host_port(protocol, config):
+    if protocol == "smtp":
+        return config["smtp_server"], config["smtp_port"]
+    return config.get("imap_server", DEFAULT_IMAP_SERVER), config.get("imap_port", DEFAULT_IMAP_PORT)
+
+
+@contextmanager
+def _connection(protocol, config, opener):
+    host, port = _host_port(protocol, config)
+    key = (protocol, host, port, config["sender_email"])
+
+    conn = None
+    while conn is None:
+        with _lock:
+            idle = _idle.get(key)
+            candidate, last_used = idle.pop() if idle else (None, 0.0)
+        if candidate is None:
+            conn = opener(config)
+        elif time.monotonic() - last_used < MAX_IDLE and _alive(protocol, candidate):
+            conn = candidate
+        else:
+            _close(protocol, candidate)
+
+    try:
+        yield conn
+    except BaseException:
+        # State unknown after a failure mid-conversation: never hand it out again
+        _close(protocol, conn)
+        raise
+    _remember_session(host, port, conn.sock)
+    with _lock:
+        _idle.setdefault(key, []).append((conn, time.monotonic()))
+
+
+def smtp_connection(config):
+    """Logged-in SMTP connection from the pool: `with smtp_connection(config) as s:`."""
+    return _connection("smtp", config, _open_smtp)
+
+
+def imap_connection(config):
+    """Logged-in IMAP connection from the pool: `with imap_connection(config) as mail:`."""
+    return _connection("imap", config, _open_imap)
+
+
+def close_all():
+    with _lock:
+        pooled = [(key[0], conn) for key, conns in _idle.items() for conn, _ in conns]
+        _idle.clear()
+    for protocol, conn in pooled:
+        _close(protocol, conn)
+
+
+atexit.register(close_all)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    with open(CONFIG_FILE, "r", encoding="utf-8-sig") as f:
+        config = json.load(f)
+
+    for attempt in (1, 2):
+        with smtp_connection(config):
+            pass
+        with imap_connection(config):
+            pass
+        if attempt == 1:
+            close_all()     # force a reconnect to show session resumption
+
+    for t in timings():
+        total = t["connect_ms"] + t["handshake_ms"] + t["auth_ms"]
+        print(f"   {t['protocol']:<5} {t['host']:<18} total {total:7.1f} ms  resumed={t['resumed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,17 +7,27 @@ Runs every 5 minutes via cron.
 """
 
 import json
-import imaplib
 import email as email_lib
-import smtplib
 import sys
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import parseaddr
 from datetime import datetime
 from pathlib import Path
 
+import detail_cards
+import engagement_stats
+import idea_shards
+import mail_connections
+import reply_cleaner
+import report_archive
+import similar_ideas
+import state_files
+
 # ─── Constants ───────────────────────────────────────────────────────────────
 BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / "config.json"
@@ -51,85 +61,79 @@ def save_json(fp: Path, data):
 
 # ─── IMAP: Check for replies ────────────────────────────────────────────────
 def get_reply_emails(config):
-    """Connect via IMAP and find unread replies to our digest emails."""
+    """Connect via IMAP and find unread replies to our digest emails.
+
+    Messages are read with BODY.PEEK and stay unread; mark_seen() flags them
+    once they have been answered, so a reply whose answer failed is fetched
+    again on the next run. Replies with nothing left after cleaning are
+    flagged right away.
+    """
     replies = []
 
     try:
-        mail = imaplib.IMAP4_SSL("imap.gmail.com", 993)
-        mail.login(config["sender_email"], config["sender_password"])
-        mail.select("INBOX")
-
-        # Search for unread emails from self (replies go back to sender)
-        _, msg_nums = mail.search(None, '(UNSEEN SUBJECT "Re: " FROM "{}")'.format(config["sender_email"]))
-
-        if not msg_nums[0]:
-            # Also check for replies from the recipient (in case sender != recipient)
-            _, msg_nums = mail.search(None, '(UNSEEN SUBJECT "Re: " FROM "{}")'.format(config["recipient_email"]))
-
-        if not msg_nums[0]:
-            # Broader search: any unread reply to our subject pattern
-            _, msg_nums = mail.search(None, '(UNSEEN SUBJECT "Re: " SUBJECT "Startup Ideas")')
-
-        if msg_nums[0]:
-            for num in msg_nums[0].split():
-                _, msg_data = mail.fetch(num, "(RFC822)")
-                raw = msg_data[0][1]
-                msg = email_lib.message_from_bytes(raw)
-
-                subject = msg.get("Subject", "")
-                from_addr = msg.get("From", "")
-                msg_id = msg.get("Message-ID", "")
-
-                # Extract body text
-                body = ""
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        ct = part.get_content_type()
-                        if ct == "text/plain":
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                body = payload.decode("utf-8", errors="ignore")
-                                break
-                        elif ct == "text/html" and not body:
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                # Strip HTML tags for simple parsing
-                                html_text = payload.decode("utf-8", errors="ignore")
-                                body = re.sub(r"<[^>]+>", " ", html_text)
-                else:
-                    payload = msg.get_payload(decode=True)
-                    if payload:
-                        body = payload.decode("utf-8", errors="ignore")
-
-                # Clean up the reply body (remove quoted original message)
-                # Most email clients add "On <date> <sender> wrote:" before the quote
-                clean_body = body
-                for pattern in [
-                    r"On .+wrote:",
-                    r"----+ ?Original Message ?----+",
-                    r"From: .+",
-                    r"> ",
-                ]:
-                    parts = re.split(pattern, clean_body, maxsplit=1)
-                    if len(parts) > 1:
-                        clean_body = parts[0]
-
-                clean_body = clean_body.strip()
-
-                if clean_body:
-                    replies.append({
-                        "msg_id": msg_id,
-                        "subject": subject,
-                        "from": from_addr,
-                        "body": clean_body,
-                        "num": num,
-                    })
-                    log.info(f"📨 Found reply: \"{clean_body[:100]}...\"")
-
-                # Mark as read
-                mail.store(num, "+FLAGS", "\\Seen")
-
-        mail.logout()
+        with mail_connections.imap_connection(config) as mail:
+            mail.select("INBOX")
+
+            # Search for unread emails from self (replies go back to sender)
+            _, msg_nums = mail.uid("SEARCH", None, '(UNSEEN SUBJECT "Re: " FROM "{}")'.format(config["sender_email"]))
+
+            if not msg_nums[0]:
+                # Also check for replies from the recipient (in case sender != recipient)
+                _, msg_nums = mail.uid("SEARCH", None, '(UNSEEN SUBJECT "Re: " FROM "{}")'.format(config["recipient_email"]))
+
+            if not msg_nums[0]:
+                # Broader search: any unread reply to our subject pattern
+                _, msg_nums = mail.uid("SEARCH", None, '(UNSEEN SUBJECT "Re: " SUBJECT "Startup Ideas")')
+
+            empty = []
+            if msg_nums[0]:
+                for num in msg_nums[0].split():
+                    _, msg_data = mail.uid("FETCH", num, "(BODY.PEEK[])")
+                    raw = msg_data[0][1]
+                    msg = email_lib.message_from_bytes(raw)
+
+                    subject = msg.get("Subject", "")
+                    from_addr = msg.get("From", "")
+                    msg_id = msg.get("Message-ID", "")
+
+                    # Extract body text
+                    body, is_html = "", False
+                    if msg.is_multipart():
+                        for part in msg.walk():
+                            ct = part.get_content_type()
+                            if ct == "text/plain":
+                                payload = part.get_payload(decode=True)
+                                if payload:
+                                    body, is_html = payload.decode("utf-8", errors="ignore"), False
+                                    break
+                            elif ct == "text/html" and not body:
+                                payload = part.get_payload(decode=True)
+                                if payload:
+                                    body, is_html = payload.decode("utf-8", errors="ignore"), True
+                    else:
+                        payload = msg.get_payload(decode=True)
+                        if payload:
+                            body = payload.decode("utf-8", errors="ignore")
+
+                    # Clean up the reply body (HTML to text, drop the quoted original
+                    # and signature) in bounded time, whatever the size of the email
+                    clean_body = reply_cleaner.clean_reply(body, is_html)
+
+                    if clean_body:
+                        replies.append({
+                            "msg_id": msg_id,
+                            "subject": subject,
+                            "from": from_addr,
+                            "body": clean_body,
+                            "num": num,
+                        })
+                        log.info(f"📨 Found reply: \"{clean_body[:100]}...\"")
+                    else:
+                        empty.append(num)
+
+            # Nothing to answer in these — mark as read now
+            if empty:
+                mail.uid("STORE", b",".join(empty), "+FLAGS", "(\\Seen)")
 
     except Exception as e:
         log.error(f"❌ IMAP error: {e}")
@@ -137,7 +141,23 @@ def get_reply_emails(config):
     return replies
 
 
+def mark_seen(config, nums):
+    """Flag answered replies (IMAP UIDs from get_reply_emails) as read."""
+    if not nums:
+        return
+    try:
+        with mail_connections.imap_connection(config) as mail:
+            mail.select("INBOX")
+            mail.uid("STORE", b",".join(nums), "+FLAGS", "(\\Seen)")
+    except Exception as e:
+        # processed_replies.json still stops them being answered twice
+        log.error(f"❌ IMAP error marking replies as read: {e}")
+
+
 # ─── Match idea titles from reply body ───────────────────────────────────────
+SKIP_WORDS = {"nepal", "ai", "the", "for", "and", "pro", "app", "my", "a", "an"}
+
+
 def match_ideas(reply_body: str, pending_ideas: dict) -> list:
     """Fuzzy match idea names mentioned in the reply against pending ideas."""
     matched = []
@@ -147,7 +167,10 @@ def match_ideas(reply_body: str, pending_ideas: dict) -> list:
     if reply_lower in ("all", "send all", "all ideas", "everything", "yes", "send me all"):
         return list(pending_ideas.values())
 
-    for name, idea in pending_ideas.items():
+    # Idea numbers the user typed (e.g., "1, 3, 5" or "idea 2")
+    numbers = set(re.findall(r"\b(\d)\b", reply_lower))
+
+    for idea_index, (name, idea) in enumerate(pending_ideas.items(), start=1):
         name_lower = name.lower()
 
         # Exact or partial match
@@ -156,118 +179,33 @@ def match_ideas(reply_body: str, pending_ideas: dict) -> list:
             continue
 
         # Check individual significant words (skip common words)
-        skip_words = {"nepal", "ai", "the", "for", "and", "pro", "app", "my", "a", "an"}
-        words = [w for w in name_lower.split() if w not in skip_words and len(w) > 2]
+        words = [w for w in name_lower.split() if w not in SKIP_WORDS and len(w) > 2]
         if words and all(w in reply_lower for w in words):
             matched.append(idea)
             continue
 
-        # Check if user typed the idea number (e.g., "1, 3, 5" or "idea 2")
-        numbers = re.findall(r"\b(\d)\b", reply_lower)
-        idea_index = list(pending_ideas.keys()).index(name) + 1
         if str(idea_index) in numbers:
             matched.append(idea)
 
     return matched
 
 
-# ─── Build detailed HTML for matched ideas ───────────────────────────────────
-def build_detail_html(ideas: list, date_str: str) -> str:
-    ideas_html = ""
-    for idx, idea in enumerate(ideas, 1):
-        is_hr = idea.get("is_high_risk", False)
-        border_color = "#e94560" if is_hr else "#2d2d4a"
-        label = "🔥 HIGH-RISK HIGH-REWARD" if is_hr else f"💡 Idea #{idx}"
-        cost_color = {"Low": "#22c55e", "Medium": "#f59e0b", "High": "#ef4444"}.get(idea.get("startup_cost", ""), "#64748b")
-
-        action_rows = ""
-        for step in idea.get("action_plan", []):
-            action_rows += f'<tr><td style="padding:4px 8px;font-size:12px;color:#cbd5e1;border-bottom:1px solid #2d2d4a;">{step}</td></tr>'
-
-        hr_box = ""
-        if is_hr:
-            hr_box = f"""
-            <table width="100%" style="margin-top:16px;" cellpadding="0" cellspacing="8">
-            <tr>
-              <td width="50%" style="background:#1a0a0a;border-radius:8px;padding:12px;vertical-align:top;">
-                <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#ef4444;">⚠ WHY HIGH RISK</p>
-                <p style="margin:0;font-size:13px;color:#fca5a5;line-height:1.5;">{idea.get('high_risk_reason', '')}</p>
-              </td>
-              <td width="50%" style="background:#0a1a0a;border-radius:8px;padding:12px;vertical-align:top;">
-                <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#22c55e;">💎 WHY HIGH REWARD</p>
-                <p style="margin:0;font-size:13px;color:#86efac;line-height:1.5;">{idea.get('high_risk_reward', '')}</p>
-              </td>
-            </tr>
-            </table>"""
-
-        ideas_html += f"""
-        <table width="100%" cellpadding="0" cellspacing="0" style="margin:20px 0;background:#1e1e32;border-radius:12px;border:1px solid {border_color};">
-        <tr><td style="padding:24px;">
-          <p style="margin:0;font-size:12px;font-weight:bold;color:{'#f59e0b' if is_hr else '#64748b'};text-transform:uppercase;letter-spacing:2px;">{label}</p>
-          <h2 style="margin:6px 0 0;font-size:22px;color:#e2e8f0;">{idea['business_name']}</h2>
-          <span style="background:#2d2d4a;color:#a78bfa;padding:3px 10px;border-radius:20px;font-size:11px;">{idea['category']}</span>
-
-          <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 What It Does</p>
-          <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['what_it_does']}</p>
-
-          <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 Where It Is Working</p>
-          <p style="margin:0;font-size:14px;color:#cbd5e1;">{idea['where_working']}</p>
-
-          <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 Why It Is Growing</p>
-          <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['why_growing']}</p>
-
-          <p style="margin:16px 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 How To Adapt For Nepal</p>
-          <p style="margin:0;font-size:14px;color:#cbd5e1;line-height:1.6;">{idea['nepal_adaptation']}</p>
-
-          {hr_box}
-
-          <table width="100%" style="margin-top:16px;" cellpadding="0" cellspacing="0">
-          <tr>
-            <td width="50%">
-              <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;">🔹 Startup Cost</p>
-              <p style="margin:0;"><span style="background:{cost_color}22;color:{cost_color};padding:3px 10px;border-radius:8px;font-size:13px;font-weight:bold;">{idea['startup_cost']}</span>
-              <span style="color:#64748b;font-size:12px;margin-left:6px;">{idea.get('cost_estimate','')}</span></p>
-            </td>
-            <td width="50%">
-              <p style="margin:0 0 4px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;">🔹 Monetization</p>
-              <p style="margin:0;font-size:13px;color:#cbd5e1;">{idea['monetization']}</p>
-            </td>
-          </tr>
-          </table>
-
-          <p style="margin:16px 0 8px;font-size:11px;font-weight:bold;color:#e94560;text-transform:uppercase;letter-spacing:1px;">🔹 30-Day Action Plan</p>
-          <table width="100%" style="background:#15152a;border-radius:8px;" cellpadding="0" cellspacing="0">
-          {action_rows}
-          </table>
-        </td></tr>
-        </table>"""
-
-    html = f"""<!DOCTYPE html>
-<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1.0"></head>
-<body style="margin:0;padding:0;background:#0f0f1a;font-family:'Segoe UI',Tahoma,Geneva,Verdana,sans-serif;">
-
-<table width="100%" cellpadding="0" cellspacing="0" style="background:linear-gradient(135deg,#1a1a2e,#16213e,#0f3460);">
-<tr><td style="padding:30px 20px;text-align:center;">
-  <h1 style="margin:0;font-size:26px;color:#e94560;">📋 Full Breakdown — {len(ideas)} Idea{'s' if len(ideas) != 1 else ''}</h1>
-  <p style="margin:8px 0 0;font-size:14px;color:#a8b2d1;">{date_str}</p>
-  <p style="margin:6px 0 0;font-size:12px;color:#94a3b8;">Here are the detailed breakdowns you requested</p>
-</td></tr>
-</table>
-
-<table width="100%" cellpadding="0" cellspacing="0">
-<tr><td style="padding:0 20px 20px;">
-{ideas_html}
-</td></tr>
-</table>
-
-<table width="100%" cellpadding="0" cellspacing="0" style="background:#1a1a2e;">
-<tr><td style="padding:20px;text-align:center;">
-  <p style="margin:0;font-size:11px;color:#475569;">Business Automation System • Daily Ideas at 6:00 AM NPT</p>
-</td></tr>
-</table>
+# ─── "More like this" requests ───────────────────────────────────────────────
+# Only explicit asks ("more like KaamGarau", "similar to 2", "anything similar?");
+# "I like this one: 2" is a plain breakdown request
+SIMILAR_RE = re.compile(r"\b(more like|similar to|similar ones?|similar ideas?|anything similar|something similar)\b")
+
+
+def wants_similar(reply_body: str) -> bool:
+    return bool(SIMILAR_RE.search(reply_body.lower()))
 
-</body></html>"""
-    return html
+
+def find_similar(matched: list, k: int = 3) -> list:
+    """Ideas from the full database closest to the matched ones (reads only their shards)."""
+    if not similar_ideas.index_exists():
+        similar_ideas.update_index(idea_shards.load_ideas(), rebuild=True)
+    ids = similar_ideas.neighbour_ids([i["id"] for i in matched if "id" in i], k, idea_shards.all_ids())
+    return idea_shards.fetch_ids(ids)
 
 
 # ─── Send detail email ───────────────────────────────────────────────────────
@@ -278,18 +216,142 @@ def send_email(config, subject, html):
     msg["To"] = config["recipient_email"]
     msg.attach(MIMEText(html, "html", "utf-8"))
 
-    with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as s:
-        s.ehlo()
-        s.starttls()
-        s.ehlo()
-        s.login(config["sender_email"], config["sender_password"])
+    with mail_connections.smtp_connection(config) as s:
         s.send_message(msg)
     log.info("📧 Detail email sent!")
 
 
+def send_and_archive(config, kind, subject, html, ideas=()):
+    send_email(config, subject, html)
+    if config.get("save_reports"):
+        try:
+            cards = [detail_cards.render_detail_card(idea, idx) for idx, idea in enumerate(ideas, 1)]
+            with _files_lock:
+                report_archive.save_message(config, kind, subject, html, cards)
+        except Exception as e:
+            log.warning(f"⚠ Could not archive report: {e}")
+
+
+def build_help_html(bodies: list, pending: dict) -> str:
+    quoted = " / ".join(b[:200] for b in bodies)
+    return f"""<!DOCTYPE html>
+<html><body style="margin:0;padding:20px;background:#0f0f1a;font-family:'Segoe UI',sans-serif;">
+<div style="background:#1e1e32;border-radius:12px;padding:24px;border:1px solid #2d2d4a;">
+  <h2 style="color:#e94560;">🤔 Couldn't match your request</h2>
+  <p style="color:#cbd5e1;">I couldn't find matching ideas for: <em>"{quoted}"</em></p>
+  <p style="color:#94a3b8;">Available ideas today:</p>
+  <ul style="color:#a78bfa;">
+    {"".join(f"<li>{name}</li>" for name in pending['ideas'].keys())}
+  </ul>
+  <p style="color:#94a3b8;">Reply with one or more of these names, or just type <strong>"all"</strong> for everything.</p>
+</div>
+</body></html>"""
+
+
+# ─── Reply handling (batched per sender, senders in parallel) ───────────────
+# Archive, analytics and the similarity index aren't safe for concurrent writers
+_files_lock = threading.Lock()
+
+
+def reply_sender(reply: dict) -> str:
+    addr = parseaddr(reply.get("from", ""))[1].lower()
+    return addr or reply.get("from", "")
+
+
+def group_replies(replies: list, batch: bool) -> list:
+    """One group per sender in batch mode (poll order kept), else one per reply."""
+    if not batch:
+        return [[r] for r in replies]
+    groups = {}
+    for reply in replies:
+        groups.setdefault(reply_sender(reply), []).append(reply)
+    return list(groups.values())
+
+
+def _unique(ideas: list) -> list:
+    seen, out = set(), []
+    for idea in ideas:
+        key = idea.get("id") or idea["business_name"]
+        if key not in seen:
+            seen.add(key)
+            out.append(idea)
+    return out
+
+
+def handle_group(config: dict, pending: dict, group: list) -> list:
+    """Answer all replies of one group with a single email. Returns their msg_ids."""
+    requested, similar_to, unmatched = [], [], []
+    for reply in group:
+        matched = match_ideas(reply["body"], pending["ideas"])
+        if not matched:
+            log.info(f"⚠ Reply didn't match any ideas: \"{reply['body'][:100]}\"")
+            unmatched.append(reply["body"])
+        elif wants_similar(reply["body"]):
+            similar_to.extend(matched)
+        else:
+            requested.extend(matched)
+
+    matched = _unique(requested + similar_to)
+    if matched:
+        log.info(f"✅ Matched {len(matched)} ideas: {[i['business_name'] for i in matched]}")
+
+    similar = []
+    if similar_to:
+        with _files_lock:
+            similar = find_similar(_unique(similar_to))
+    if similar:
+        log.info(f"🔎 Similar ideas: {[i['business_name'] for i in similar]}")
+    date_str = pending.get("date_display", datetime.now().strftime("%B %d, %Y"))
+
+    if matched:
+        # The ideas asked about come first, then their neighbours
+        ideas = _unique(matched + similar)
+        html = detail_cards.build_detail_html(ideas, date_str)
+        if similar and not requested:
+            names = ", ".join(i["business_name"] for i in _unique(similar_to))
+            send_and_archive(config, "similar", f"🔎 More Like {names}", html, ideas)
+        else:
+            names = ", ".join(i["business_name"] for i in ideas)
+            send_and_archive(config, "breakdown", f"📋 Full Breakdown: {names}", html, ideas)
+    else:
+        send_and_archive(config, "help", f"📋 Help — Available Ideas for {pending.get('date_display', 'Today')}",
+                         build_help_html(unmatched, pending))
+
+    # Counted only once the answer went out; a failed send is retried next run
+    if matched:
+        try:
+            with _files_lock:
+                engagement_stats.append_events("requested", [i.get("id") for i in matched])
+        except Exception as e:
+            log.warning(f"⚠ Could not record reply analytics: {e}")
+
+    return [r["msg_id"] for r in group]
+
+
+def process_replies(config: dict, pending: dict, replies: list) -> list:
+    """Handle replies, groups concurrently. Returns msg_ids that were answered.
+
+    A group whose email fails is left out, so its replies stay unread and are retried.
+    """
+    groups = group_replies(replies, config.get("batch_replies", True))
+    workers = max(1, min(config.get("reply_workers", 4), len(groups)))
+    if len(groups) < len(replies):
+        log.info(f"📦 Coalesced {len(replies)} replies into {len(groups)} email(s)")
+
+    done = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(handle_group, config, pending, g) for g in groups]
+        for future in futures:
+            try:
+                done.extend(future.result())
+            except Exception as e:
+                log.error(f"❌ Failed to answer reply: {e}", exc_info=True)
+    return done
+
+
 # ─── Main ────────────────────────────────────────────────────────────────────
 def main():
-    config = load_json(CONFIG_FILE)
+    config = state_files.load_cached(CONFIG_FILE)
     pending = load_json(PENDING_FILE)
     processed = load_json(PROCESSED_FILE) if PROCESSED_FILE.exists() else {"processed_ids": []}
 
@@ -304,48 +366,26 @@ def main():
 
     log.info(f"📨 Found {len(replies)} new reply(ies)")
 
-    for reply in replies:
-        msg_id = reply["msg_id"]
-
-        # Skip already processed replies
-        if msg_id in processed.get("processed_ids", []):
-            continue
-
-        # Match idea titles
-        matched = match_ideas(reply["body"], pending["ideas"])
-
-        if not matched:
-            log.info(f"⚠ Reply didn't match any ideas: \"{reply['body'][:100]}\"")
-            # Send a helpful response
-            no_match_html = f"""<!DOCTYPE html>
-<html><body style="margin:0;padding:20px;background:#0f0f1a;font-family:'Segoe UI',sans-serif;">
-<div style="background:#1e1e32;border-radius:12px;padding:24px;border:1px solid #2d2d4a;">
-  <h2 style="color:#e94560;">🤔 Couldn't match your request</h2>
-  <p style="color:#cbd5e1;">I couldn't find matching ideas for: <em>"{reply['body'][:200]}"</em></p>
-  <p style="color:#94a3b8;">Available ideas today:</p>
-  <ul style="color:#a78bfa;">
-    {"".join(f"<li>{name}</li>" for name in pending['ideas'].keys())}
-  </ul>
-  <p style="color:#94a3b8;">Reply with one or more of these names, or just type <strong>"all"</strong> for everything.</p>
-</div>
-</body></html>"""
-            send_email(config, f"📋 Help — Available Ideas for {pending.get('date_display', 'Today')}", no_match_html)
-        else:
-            log.info(f"✅ Matched {len(matched)} ideas: {[i['business_name'] for i in matched]}")
-            date_str = pending.get("date_display", datetime.now().strftime("%B %d, %Y"))
-            names = ", ".join(i["business_name"] for i in matched)
-            html = build_detail_html(matched, date_str)
-            send_email(config, f"📋 Full Breakdown: {names}", html)
-
-        # Mark as processed
-        processed.setdefault("processed_ids", []).append(msg_id)
+    # Skip already processed replies (answered before, but not flagged as read)
+    seen = set(processed.get("processed_ids", []))
+    answered = [r for r in replies if r["msg_id"] in seen]
+    replies = [r for r in replies if r["msg_id"] not in seen]
 
+    # Mark as processed
+    done = process_replies(config, pending, replies)
+    processed.setdefault("processed_ids", []).extend(done)
     save_json(PROCESSED_FILE, processed)
 
+    # Only answered replies are flagged as read; failed ones are fetched again next run
+    done = set(done)
+    answered += [r for r in replies if r["msg_id"] in done]
+    mark_seen(config, [r["num"] for r in answered])
+
 
 if __name__ == "__main__":
     try:
-        main()
+        with state_files.state_lock():
+            main()
     except Exception as e:
         log.error(f"❌ Reply checker error: {e}", exc_info=True)
         sys.exit(1)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Reply Body Cleaner
+Turns a decoded reply (plain text or HTML) into just the reader's own words:
+HTML is converted to text by a single forward scan, then the text is cut at
+the first quote or signature boundary ("On … wrote:", "-----Original
+Message-----", "From: …", "> " quoting, "-- " signatures, "Sent from my …").
+Both passes look at each character a bounded number of times and at most
+MAX_SCAN_CHARS of input, so a huge or adversarial reply cannot stall a run.
+
+Usage:
+    python reply_cleaner.py bench            # old regex cleanup vs this, growing inputs
+    python reply_cleaner.py fuzz 2000        # random inputs: invariants + time per char
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from html import unescape
+
+MAX_SCAN_CHARS = 200_000    # the reply sits at the top; the rest is quotes or junk
+MAX_BODY_CHARS = 20_000     # cleaned text handed to match_ideas
+
+# Tags that end a line of text; <blockquote> additionally starts a quote
+BLOCK_TAGS = {"br", "p", "div", "li", "tr", "table", "h1", "h2", "h3", "h4", "h5", "h6", "hr"}
+SKIP_TAGS = {"script", "style", "head", "title"}
+TAG_NAME_CHARS = 12
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  HTML → TEXT
+# ═══════════════════════════════════════════════════════════════════════════
+def _tag_name(html, lt, gt):
+    """Lower-case tag name of html[lt:gt+1], and whether it is a closing tag."""
+    head = html[lt + 1:min(gt, lt + 2 + TAG_NAME_CHARS)]
+    closing = head.startswith("/")
+    head = head.lstrip("/")
+    end = 0
+    while end < len(head) and head[end].isalnum():
+        end += 1
+    return head[:end].lower(), closing
+
+
+def _skip_element(html, name, pos):
+    """Index just past </name …>, or len(html) if the element never closes."""
+    while True:
+        j = html.find("</", pos)
+        if j < 0:
+            return len(html)
+        if html[j + 2:j + 2 + len(name)].lower() == name:
+            gt = html.find(">", j)
+            return len(html) if gt < 0 else gt + 1
+        pos = j + 2
+
+
+def html_to_text(html, limit=MAX_SCAN_CHARS):
+    """Visible text of an HTML body in one forward pass over at most `limit` chars."""
+    html = html[:limit]
+    out, pos, n = [], 0, len(html)
+    while pos < n:
+        lt = html.find("<", pos)
+        if lt < 0:
+            lt = n
+        if lt > pos:
+            out.append(unescape(html[pos:lt]))
+        if lt >= n:
+            break
+        if html.startswith("<!--", lt):
+            end = html.find("-->", lt + 4)
+            pos = n if end < 0 else end + 3
+            continue
+        gt = html.find(">", lt + 1)
+        if gt < 0:
+            break                       # unterminated tag: nothing visible follows
+        name, closing = _tag_name(html, lt, gt)
+        pos = gt + 1
+        if name in SKIP_TAGS and not closing:
+            pos = _skip_element(html, name, pos)
+        elif name == "blockquote" and not closing:
+            out.append("\n> ")
+        elif name in BLOCK_TAGS or name == "blockquote":
+            out.append("\n")
+        else:
+            out.append(" ")
+    return "".join(out)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  QUOTE / SIGNATURE BOUNDARY
+# ═══════════════════════════════════════════════════════════════════════════
+def _boundary(line):
+    """Column where quoted/signature text starts in this line, or -1."""
+    bare = line.lstrip()
+    if bare.startswith(">") or line.rstrip() == "--" or bare.startswith("Sent from my "):
+        return len(line) - len(bare)
+    at = line.find("On ")
+    if at >= 0 and line.find("wrote:", at + 4) >= 0:
+        return at
+    at = line.find("Original Message")
+    if at >= 0 and line.find("----") >= 0:
+        return min(at, line.find("----"))
+    at = line.find("From: ")
+    if at >= 0 and len(line) > at + 6:
+        return at
+    return -1
+
+
+def strip_quoted(text, limit=MAX_BODY_CHARS):
+    """The reader's own text: everything before the first quote boundary."""
+    kept = []
+    attribution = False                 # previous line starts "On …" without "wrote:"
+    for line in text[:MAX_SCAN_CHARS].split("\n"):
+        line = line.rstrip("\r")
+        cut = _boundary(line)
+        if cut < 0 and attribution and "wrote:" in line:
+            # Clients wrap long "On <date> <sender> wrote:" lines in two
+            kept.pop()
+            break
+        if cut >= 0:
+            kept.append(line[:cut])
+            break
+        attribution = line.lstrip().startswith("On ")
+        kept.append(line)
+    return "\n".join(kept).strip()[:limit]
+
+
+def clean_reply(body, is_html=False):
+    """Decoded reply body → the text match_ideas should look at."""
+    if is_html:
+        body = html_to_text(body)
+    return strip_quoted(body)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BENCHMARK / FUZZ
+# ═══════════════════════════════════════════════════════════════════════════
+def legacy_clean(body, is_html=False):
+    """The regex cleanup reply_checker used before, kept for comparison."""
+    if is_html:
+        body = re.sub(r"<[^>]+>", " ", body)
+    for pattern in [r"On .+wrote:", r"----+ ?Original Message ?----+", r"From: .+", r"> "]:
+        parts = re.split(pattern, body, maxsplit=1)
+        if len(parts) > 1:
+            body = parts[0]
+    return body.strip()
+
+
+ADVERSARIAL = {
+    "'On ' repeated, no 'wrote:'": ("On " * 40, False),
+    "'<' repeated, no '>'": ("<a" * 60, True),
+    "'From: ' repeated": ("From: x " * 15, False),
+    "long single line": ("send idea 2 please " * 6, False),
+    "nested tags": ("<div><b>1</b> <i>&amp;</i></div>" * 4, True),
+}
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def benchmark(sizes, legacy_budget=2.0):
+    for label, (unit, is_html) in ADVERSARIAL.items():
+        print(f"📊 {label}")
+        legacy_ok = True
+        for size in sizes:
+            body = (unit * (size // len(unit) + 1))[:size]
+            new = _timed(clean_reply, body, is_html)
+            line = f"   {size:>9,} chars  cleaner {new * 1000:8.2f} ms ({new * 1e9 / size:6.1f} ns/char)"
+            if legacy_ok:
+                old = _timed(legacy_clean, body, is_html)
+                line += f"   regex {old * 1000:10.2f} ms"
+                legacy_ok = old < legacy_budget
+            else:
+                line += "   regex    (skipped, over budget)"
+            print(line)
+
+
+TOKENS = ["<", ">", "</", "<div>", "<blockquote>", "<script>", "</script>", "<!--", "-->", "&amp;", "&#",
+          "On ", "wrote:", "From: ", "> ", ">", "-- ", "----", "Original Message", "Sent from my ",
+          "\n", "\r\n", " ", "1", "2", "idea", "BillKhata", "₨", "ā"]
+
+
+def fuzz(cases, seed=1, max_ns_per_char=20_000):
+    rng = random.Random(seed)
+    failures, worst = 0, 0.0
+    for k in range(cases):
+        size = rng.choice((10, 100, 1_000, 10_000, 100_000))
+        body = "".join(rng.choices(TOKENS, k=size // 4 + 1))
+        is_html = rng.random() < 0.5
+        try:
+            started = time.perf_counter()
+            out = clean_reply(body, is_html)
+            elapsed = time.perf_counter() - started
+        except Exception as e:
+            print(f"❌ case {k}: {type(e).__name__}: {e}")
+            failures += 1
+            continue
+        per_char = elapsed * 1e9 / len(body)
+        if len(body) >= 10_000:
+            worst = max(worst, per_char)
+        problems = []
+        if len(out) > MAX_BODY_CHARS:
+            problems.append("over length cap")
+        if any(line.lstrip().startswith(">") for line in out.split("\n")):
+            problems.append("quoted line kept")
+        if len(body) >= 10_000 and per_char > max_ns_per_char:
+            problems.append(f"{per_char:.0f} ns/char")
+        if problems:
+            print(f"❌ case {k} ({len(body)} chars, html={is_html}): {', '.join(problems)}")
+            failures += 1
+    print(f"{'✅' if not failures else '❌'} {cases} fuzz cases, {failures} failures, "
+          f"worst {worst:.1f} ns/char on inputs ≥ 10k chars")
+    return failures
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and fuzz the reply body cleaner.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_bench = sub.add_parser("bench")
+    p_bench.add_argument("--max", type=int, default=1_600_000, help="largest input, chars")
+    p_fuzz = sub.add_parser("fuzz")
+    p_fuzz.add_argument("cases", type=int, nargs="?", default=2000)
+    p_fuzz.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.cmd == "bench":
+        sizes, size = [], 10_000
+        while size <= args.max:
+            sizes.append(size)
+            size *= 2
+        benchmark(sizes)
+    elif args.cmd == "fuzz":
+        sys.exit(1 if fuzz(args.cases, args.seed) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Report Archive
+Implements the "save_reports" / "reports_dir" config options. Every sent email
+is split into fragments (one per idea card plus the template text between
+them), each stored once, zlib-compressed and keyed by its SHA-256. A message
+is just the list of its fragment hashes, indexed by date and subscriber, so
+repeated cards cost nothing and any past email can be rebuilt exactly.
+
+Usage:
+    python report_archive.py list                       # latest messages
+    python report_archive.py list --date 2026-02-14
+    python report_archive.py list --to someone@gmail.com
+    python report_archive.py show 42 > email.html       # rebuild message #42
+    python report_archive.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+DEFAULT_REPORTS_DIR = "reports"
+DB_NAME = "archive.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fragments (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    sent_at TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    subscriber TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    parts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_date ON messages(date);
+CREATE INDEX IF NOT EXISTS messages_subscriber ON messages(subscriber, date);
+"""
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def archive_path(config):
+    reports_dir = Path(config.get("reports_dir") or DEFAULT_REPORTS_DIR)
+    if not reports_dir.is_absolute():
+        reports_dir = BASE_DIR / reports_dir
+    return reports_dir / DB_NAME
+
+
+def connect(config):
+    fp = archive_path(config)
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(fp)
+    db.executescript(SCHEMA)
+    return db
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FRAGMENTS
+# ═══════════════════════════════════════════════════════════════════════════
+def split_fragments(html, fragments):
+    """Cut html at each fragment (in order): template text and cards alternate."""
+    parts, pos = [], 0
+    for frag in fragments:
+        at = html.find(frag, pos)
+        if not frag or at < 0:
+            continue
+        if at > pos:
+            parts.append(html[pos:at])
+        parts.append(frag)
+        pos = at + len(frag)
+    if pos < len(html):
+        parts.append(html[pos:])
+    return parts
+
+
+def _put(db, text):
+    raw = text.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    db.execute(
+        "INSERT OR IGNORE INTO fragments (hash, size, data) VALUES (?, ?, ?)",
+        (digest, len(raw), zlib.compress(raw, 9)),
+    )
+    return digest
+
+
+def save_message(config, kind, subject, html, fragments=(), subscriber=None, sent_at=None):
+    """Archive one sent email. Returns its message id."""
+    sent_at = sent_at or datetime.now()
+    subscriber = subscriber or config.get("recipient_email", "")
+    db = connect(config)
+    try:
+        with db:
+            hashes = [_put(db, part) for part in split_fragments(html, fragments)]
+            cur = db.execute(
+                "INSERT INTO messages (sent_at, date, kind, subscriber, subject, parts) VALUES (?, ?, ?, ?, ?, ?)",
+                (sent_at.isoformat(timespec="seconds"), sent_at.strftime("%Y-%m-%d"), kind,
+                 subscriber, subject, json.dumps(hashes)),
+            )
+        return cur.lastrowid
+    finally:
+        db.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  LOOKUP
+# ═══════════════════════════════════════════════════════════════════════════
+def find_messages(config, date=None, subscriber=None, limit=50):
+    query, args = "SELECT id, sent_at, kind, subscriber, subject FROM messages WHERE 1=1", []
+    if date:
+        query += " AND date = ?"
+        args.append(date)
+    if subscriber:
+        query += " AND subscriber = ?"
+        args.append(subscriber)
+    query += " ORDER BY id DESC LIMIT ?"
+    args.append(limit)
+    db = connect(config)
+    try:
+        return db.execute(query, args).fetchall()
+    finally:
+        db.close()
+
+
+def rebuild_message(config, message_id):
+    """Original HTML of an archived message, or None if the id is unknown."""
+    db = connect(config)
+    try:
+        row = db.execute("SELECT parts FROM messages WHERE id = ?", (message_id,)).fetchone()
+        if row is None:
+            return None
+        hashes = json.loads(row[0])
+        marks = ",".join("?" * len(set(hashes)))
+        blobs = dict(db.execute(f"SELECT hash, data FROM fragments WHERE hash IN ({marks})", list(set(hashes))))
+        return "".join(zlib.decompress(blobs[h]).decode("utf-8") for h in hashes)
+    finally:
+        db.close()
+
+
+def stats(config):
+    db = connect(config)
+    try:
+        messages, logical = 0, 0
+        sizes = dict(db.execute("SELECT hash, size FROM fragments"))
+        for (parts,) in db.execute("SELECT parts FROM messages"):
+            messages += 1
+            logical += sum(sizes.get(h, 0) for h in json.loads(parts))
+        fragments, raw, stored = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM fragments"
+        ).fetchone()
+        return {"messages": messages, "fragments": fragments, "html_bytes": logical,
+                "unique_bytes": raw, "stored_bytes": stored}
+    finally:
+        db.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Browse the archive of sent reports.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_list = sub.add_parser("list")
+    p_list.add_argument("--date")
+    p_list.add_argument("--to", dest="subscriber")
+    p_list.add_argument("--limit", type=int, default=50)
+    p_show = sub.add_parser("show")
+    p_show.add_argument("message_id", type=int)
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    config = load_json(CONFIG_FILE) if CONFIG_FILE.exists() else {}
+
+    if args.cmd == "list":
+        for mid, sent_at, kind, subscriber, subject in find_messages(config, args.date, args.subscriber, args.limit):
+            print(f"   #{mid:<5} {sent_at}  {kind:<9} {subscriber:<28} {subject}")
+    elif args.cmd == "show":
+        html = rebuild_message(config, args.message_id)
+        if html is None:
+            print(f"❌ No archived message #{args.message_id}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write(html)
+    elif args.cmd == "stats":
+        s = stats(config)
+        ratio = s["html_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0
+        print(f"📦 {s['messages']} messages, {s['fragments']} unique fragments")
+        print(f"   {s['html_bytes'] / 1024:.1f} KB of HTML stored in {s['stored_bytes'] / 1024:.1f} KB ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
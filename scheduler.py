@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Resident Scheduler
+One long-running process that replaces the per-tick cron entries. Jobs are
+defined with cron expressions; modules, config and the catalogue stay loaded
+between ticks, and every job runs under the shared state-file lock.
+
+Usage:
+    python scheduler.py                    # run forever
+    python scheduler.py run-once           # run jobs due this minute, then exit (cron-compatible)
+    python scheduler.py run-once briefing  # run one job now, then exit
+    python scheduler.py list               # show jobs and their next run
+
+Schedule can be overridden in config.json:
+    "schedule": {"briefing": ["0 6 * * *", "0 17 * * *"], "replies": "*/5 * * * *"}
+"""
+
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import daily_ideas_sender
+import reply_checker
+import state_files
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+
+log = logging.getLogger("scheduler")
+
+JOBS = {
+    "briefing": daily_ideas_sender.main,
+    "replies": reply_checker.main,
+}
+DEFAULT_SCHEDULE = {
+    "briefing": ["0 6 * * *", "0 17 * * *"],
+    "replies": "*/5 * * * *",
+}
+MAX_CATCH_UP = timedelta(minutes=10)    # missed minutes further back than this are not run
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CRON EXPRESSIONS
+# ═══════════════════════════════════════════════════════════════════════════
+FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_field(text, lo, hi):
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/", 1)
+            step = int(step)
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step > 1:
+                end = hi
+        if start < lo or end > hi or start > end or step < 1:
+            raise ValueError(f"out of range: {text!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expr):
+    """'m h dom mon dow' -> dict of allowed values (dow: 0 = Sunday, 7 also accepted)."""
+    parts = expr.split()
+    if len(parts) != 5:
+        raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+    spec = {"expr": expr}
+    for (name, lo, hi), text in zip(FIELDS, parts):
+        spec[name] = _parse_field(text, lo, hi)
+        if name == "weekday":
+            spec[name] = {v % 7 for v in spec[name]}
+        spec[name + "_any"] = text.startswith("*")
+    return spec
+
+
+def cron_matches(spec, t):
+    if t.minute not in spec["minute"] or t.hour not in spec["hour"] or t.month not in spec["month"]:
+        return False
+    dom = t.day in spec["day"]
+    dow = (t.weekday() + 1) % 7 in spec["weekday"]
+    # Classic cron: when both day fields are restricted, either may match
+    if not spec["day_any"] and not spec["weekday_any"]:
+        return dom or dow
+    return dom and dow
+
+
+def next_run(spec, after):
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(366 * 24 * 60):
+        if cron_matches(spec, t):
+            return t
+        t += timedelta(minutes=1)
+    return None
+
+
+def load_schedule():
+    config = state_files.load_cached(CONFIG_FILE) if CONFIG_FILE.exists() else {}
+    schedule = dict(DEFAULT_SCHEDULE, **config.get("schedule", {}))
+    jobs = []
+    for name, exprs in schedule.items():
+        if name not in JOBS:
+            log.warning(f"⚠ Unknown job in schedule: {name}")
+            continue
+        for expr in [exprs] if isinstance(exprs, str) else exprs:
+            jobs.append((name, parse_cron(expr)))
+    return jobs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RUNNING
+# ═══════════════════════════════════════════════════════════════════════════
+def run_job(name):
+    started = time.perf_counter()
+    try:
+        with state_files.state_lock():
+            JOBS[name]()
+    except SystemExit:
+        pass
+    except Exception as e:
+        log.error(f"❌ Job {name} failed: {e}", exc_info=True)
+    else:
+        log.debug(f"Job {name} finished in {time.perf_counter() - started:.2f}s")
+
+
+def run_due(jobs, start, end=None):
+    """Run each job at most once if any of its expressions matches a minute in [start, end]."""
+    end = end or start
+    due = []
+    t = start
+    while t <= end:
+        for name, spec in jobs:
+            if name not in due and cron_matches(spec, t):
+                due.append(name)
+        t += timedelta(minutes=1)
+    for name in due:
+        run_job(name)
+    return due
+
+
+def run_forever():
+    log.info("⏰ Scheduler started")
+    last = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=1)
+    while True:
+        jobs = load_schedule()
+        now = datetime.now().replace(second=0, microsecond=0)
+        # Catch up on minutes skipped while a long job was running, each job once;
+        # a longer gap (suspend, clock jump) is skipped rather than replayed
+        start = last + timedelta(minutes=1)
+        if now - start >= MAX_CATCH_UP:
+            skipped, start = start, now - MAX_CATCH_UP + timedelta(minutes=1)
+            log.warning(f"⚠ Skipping {(start - skipped) // timedelta(minutes=1)} missed minute(s) "
+                        f"from {skipped:%Y-%m-%d %H:%M}")
+        run_due(jobs, start, now)
+        last = now
+        time.sleep(max(1.0, 60 - datetime.now().second))
+
+
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if cmd == "run":
+        try:
+            run_forever()
+        except KeyboardInterrupt:
+            log.info("⏹ Scheduler stopped")
+    elif cmd == "run-once":
+        if len(sys.argv) > 2:
+            if sys.argv[2] not in JOBS:
+                print(f"❌ Unknown job: {sys.argv[2]} (jobs: {', '.join(JOBS)})")
+                sys.exit(2)
+            run_job(sys.argv[2])
+        else:
+            run_due(load_schedule(), datetime.now().replace(second=0, microsecond=0))
+    elif cmd == "list":
+        now = datetime.now()
+        for name, spec in load_schedule():
+            print(f"   {name:<10} {spec['expr']:<16} next: {next_run(spec, now):%Y-%m-%d %H:%M}")
+    else:
+        print(f"❌ Unknown command: {cmd} (use run, run-once or list)")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
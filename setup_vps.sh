@@ -24,18 +24,33 @@ if [ ! -f "config.json" ]; then
     echo "❗ PLEASE EDIT config.json with your actual credentials!"
 fi
 
-# 4. Setup Cron Jobs (6:00 AM & 5:00 PM)
-echo "⏰ Setting up Cron Jobs..."
+# 4. Setup Scheduler Service (one resident process instead of cron ticks)
+echo "⏰ Setting up scheduler service..."
 REPO_DIR="$HOME/daily-business-ideas-automation"
-CRON_CMD="python3 $REPO_DIR/daily_ideas_sender.py >> $REPO_DIR/cron_log.txt 2>&1"
 
-# Check if cron already exists
-(crontab -l 2>/dev/null | grep -v "daily_ideas_sender.py") | crontab -
+# Remove the old per-tick cron jobs if present
+(crontab -l 2>/dev/null | grep -v "daily_ideas_sender.py" | grep -v "reply_checker.py") | crontab -
 
-# Add new jobs (Morning 6am, Evening 5pm)
-(crontab -l 2>/dev/null; echo "0 6 * * * $CRON_CMD") | crontab -
-(crontab -l 2>/dev/null; echo "0 17 * * * $CRON_CMD") | crontab -
+sudo tee /etc/systemd/system/daily-ideas.service > /dev/null <<EOF
+[Unit]
+Description=Daily Business Ideas scheduler
+After=network-online.target
+
+[Service]
+WorkingDirectory=$REPO_DIR
+ExecStart=/usr/bin/python3 $REPO_DIR/scheduler.py
+Restart=always
+RestartSec=30
+User=$USER
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+sudo systemctl daemon-reload
+sudo systemctl enable --now daily-ideas.service
 
 echo "✅ Deployment Complete!"
 echo "👉 Run 'nano config.json' to add your email password."
-echo "👉 Run 'python3 daily_ideas_sender.py' to test immediately."
+echo "👉 Run 'python3 scheduler.py run-once briefing' to test immediately."
+echo "👉 Run 'sudo systemctl restart daily-ideas' after editing config.json."
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — "More Like This" Similarity Index
+Hashed-feature TF-IDF vectors for the whole catalogue, stored as flat binary
+arrays that are memory-mapped on load. Serves top-k cosine neighbours for any
+idea id.
+
+An ingest (update_database.py) only appends the new rows to a small delta
+file, weighted with the df at that moment; queries read the delta alongside
+the mapped base. Older rows keep their weights until a re-weigh merges the
+delta and recomputes every row from the stored term counts — update_database.py
+triggers one once the delta reaches REWEIGH_RATIO of the base, or run it with
+--reweigh.
+
+Usage:
+    python similar_ideas.py ai04              # 5 ideas most like ai04
+    python similar_ideas.py ai04 -k 10
+    python similar_ideas.py --reweigh         # merge the delta, re-weigh every row
+    python similar_ideas.py --rebuild         # re-vectorize everything from the catalogue
+    python similar_ideas.py --bench 100000    # synthetic benchmark
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import random
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+import idea_shards
+import state_files
+
+BASE_DIR = Path(__file__).parent
+IDEAS_FILE = BASE_DIR / "ideas_database.json"
+INDEX_META_FILE = BASE_DIR / "similarity_index.json"
+INDEX_DATA_FILE = BASE_DIR / "similarity_index.bin"
+INDEX_DELTA_FILE = BASE_DIR / "similarity_index.delta"
+
+INDEX_VERSION = 2      # 2: raw term counts stored next to the weights, appended rows in a delta file
+DIM = 1 << 18          # hashed feature space (buckets)
+HEADER = struct.Struct("<4sIIII")   # magic, version, n_docs, nnz, dim
+DELTA_ROW = struct.Struct("<HI")    # id length, nnz; then id, buckets, counts, weights
+REWEIGH_RATIO = 0.2    # re-weigh once the delta holds this share of the base rows...
+REWEIGH_MIN_ROWS = 200  # ...and at least this many
+MAGIC = b"SIMX"
+
+# Fields that describe *what* an idea is (action plans are too generic to help)
+TEXT_FIELDS = ("business_name", "category", "what_it_does", "why_growing", "nepal_adaptation", "monetization")
+STOP_WORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "was", "into", "their", "your",
+    "you", "our", "all", "can", "get", "via", "per", "has", "have", "not", "but", "its", "who",
+    "one", "more", "than", "like", "just", "also", "use", "using", "any", "out", "over", "need",
+}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+def save_json(fp, data):
+    with open(fp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  VECTORIZING
+# ═══════════════════════════════════════════════════════════════════════════
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOP_WORDS]
+
+
+def term_counts(idea):
+    """Bucket -> raw count over the idea's descriptive text (name/category weighted x3)."""
+    counts = {}
+    for field in TEXT_FIELDS:
+        weight = 3 if field in ("business_name", "category") else 1
+        for tok in tokenize(str(idea.get(field, ""))):
+            b = zlib.crc32(tok.encode("utf-8")) & (DIM - 1)
+            counts[b] = counts.get(b, 0) + weight
+    return counts
+
+
+def weigh(counts, df, n_docs):
+    """Sublinear tf * smoothed idf, L2-normalized. Returns sorted (buckets, weights)."""
+    weights = {}
+    for b, c in counts.items():
+        idf = math.log((1 + n_docs) / (1 + df.get(b, 0))) + 1.0
+        weights[b] = (1.0 + math.log(c)) * idf
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    buckets = sorted(weights)
+    return buckets, [weights[b] / norm for b in buckets]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BUILD / PERSIST
+# ═══════════════════════════════════════════════════════════════════════════
+def _write_index(ids, row_ptr, row_idx, row_cnt, row_val):
+    """Write rows (CSR) plus the transposed postings (CSC) used for scoring."""
+    n, nnz = len(ids), len(row_idx)
+
+    col_ptr = array("I", bytes(4 * (DIM + 1)))
+    for b in row_idx:
+        col_ptr[b + 1] += 1
+    for b in range(DIM):
+        col_ptr[b + 1] += col_ptr[b]
+
+    fill = array("I", col_ptr)
+    col_doc = array("I", bytes(4 * nnz))
+    col_val = array("f", bytes(4 * nnz))
+    for doc in range(n):
+        for j in range(row_ptr[doc], row_ptr[doc + 1]):
+            b = row_idx[j]
+            pos = fill[b]
+            col_doc[pos] = doc
+            col_val[pos] = row_val[j]
+            fill[b] = pos + 1
+
+    tmp = INDEX_DATA_FILE.with_suffix(".bin.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, INDEX_VERSION, n, nnz, DIM))
+        for arr in (row_ptr, row_idx, row_cnt, row_val, col_ptr, col_doc, col_val):
+            arr.tofile(f)
+    tmp.replace(INDEX_DATA_FILE)
+
+    save_json(INDEX_META_FILE, {"version": INDEX_VERSION, "dim": DIM, "ids": ids})
+    if INDEX_DELTA_FILE.exists():
+        INDEX_DELTA_FILE.unlink()
+
+
+def _open_base():
+    """(meta, mmap, n, nnz) of the base index, or None if missing or from another version."""
+    if not (INDEX_META_FILE.exists() and INDEX_DATA_FILE.exists()):
+        return None
+    meta = load_json(INDEX_META_FILE)
+    if meta.get("version") != INDEX_VERSION or meta.get("dim") != DIM:
+        return None
+    with open(INDEX_DATA_FILE, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, n, nnz, _ = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != INDEX_VERSION or n != len(meta["ids"]):
+        mm.close()
+        return None
+    return meta, mm, n, nnz
+
+
+def _base_arrays(mm, n, nnz):
+    """Views over the mapped base file, in file order."""
+    view = memoryview(mm)
+    offset = HEADER.size
+    arrays = [view]
+    for count, code in ((n + 1, "I"), (nnz, "I"), (nnz, "I"), (nnz, "f"), (DIM + 1, "I"), (nnz, "I"), (nnz, "f")):
+        arrays.append(view[offset:offset + 4 * count].cast(code))
+        offset += 4 * count
+    return arrays
+
+
+def _release(views, mm):
+    for v in reversed(views):
+        v.release()
+    mm.close()
+
+
+def _read_delta():
+    """Rows appended since the last full write: ([(id, buckets, counts, weights)], valid bytes).
+
+    A record cut short by a crash mid-append is ignored (and overwritten by the next append).
+    """
+    if not INDEX_DELTA_FILE.exists():
+        return [], 0
+    data = INDEX_DELTA_FILE.read_bytes()
+    rows, pos = [], 0
+    while pos + DELTA_ROW.size <= len(data):
+        id_len, nnz = DELTA_ROW.unpack_from(data, pos)
+        end = pos + DELTA_ROW.size + id_len + 12 * nnz
+        if end > len(data):
+            break
+        at = pos + DELTA_ROW.size
+        idea_id = data[at:at + id_len].decode("utf-8")
+        at += id_len
+        buckets = array("I", data[at:at + 4 * nnz])
+        counts = array("I", data[at + 4 * nnz:at + 8 * nnz])
+        weights = array("f", data[at + 8 * nnz:end])
+        rows.append((idea_id, buckets, counts, weights))
+        pos = end
+    return rows, pos
+
+
+def index_exists():
+    base = _open_base()
+    if base is None:
+        return False
+    base[1].close()
+    return True
+
+
+def update_index(ideas, rebuild=False):
+    """Add ideas not yet in the index. Returns number of ideas added.
+
+    With an existing index this only appends rows for the new ideas to the
+    delta file, weighted with the current df; existing rows are not touched.
+    Without one (or with rebuild=True) it builds the whole index from ideas.
+    """
+    base = None if rebuild else _open_base()
+    if base is None:
+        return _build(ideas)
+
+    meta, mm, n, nnz = base
+    views = _base_arrays(mm, n, nnz)
+    col_ptr = views[5]
+    try:
+        delta, valid = _read_delta()
+        known = set(meta["ids"])
+        known.update(row[0] for row in delta)
+        new = [i for i in ideas if i["id"] not in known]
+        if not new:
+            return 0
+
+        # df = base postings per bucket + delta rows + the new rows (only buckets the new rows use)
+        new_counts = [term_counts(i) for i in new]
+        df = {}
+        for counts in new_counts:
+            for b in counts:
+                df[b] = df.get(b, 0) + 1
+        for row in delta:
+            for b in row[1]:
+                if b in df:
+                    df[b] += 1
+        for b in df:
+            df[b] += col_ptr[b + 1] - col_ptr[b]
+    finally:
+        _release(views, mm)
+
+    n_docs = n + len(delta) + len(new)
+    out = bytearray()
+    for idea, counts in zip(new, new_counts):
+        buckets, weights = weigh(counts, df, n_docs)
+        raw_id = idea["id"].encode("utf-8")
+        out += DELTA_ROW.pack(len(raw_id), len(buckets)) + raw_id
+        out += array("I", buckets).tobytes()
+        out += array("I", [counts[b] for b in buckets]).tobytes()
+        out += array("f", weights).tobytes()
+
+    with open(INDEX_DELTA_FILE, "ab") as f:
+        f.truncate(valid)
+        f.write(out)
+    return len(new)
+
+
+def _build(ideas):
+    """Vectorize and write a whole catalogue."""
+    all_counts = [term_counts(i) for i in ideas]
+    df = {}
+    for counts in all_counts:
+        for b in counts:
+            df[b] = df.get(b, 0) + 1
+    _write_rows([i["id"] for i in ideas], all_counts, df)
+    return len(ideas)
+
+
+def _write_rows(ids, all_counts, df):
+    row_ptr, row_idx, row_cnt, row_val = array("I", [0]), array("I"), array("I"), array("f")
+    for counts in all_counts:
+        buckets, weights = weigh(counts, df, len(ids))
+        row_idx.extend(buckets)
+        row_cnt.extend(counts[b] for b in buckets)
+        row_val.extend(weights)
+        row_ptr.append(len(row_idx))
+    _write_index(ids, row_ptr, row_idx, row_cnt, row_val)
+
+
+def pending_rows():
+    """(rows in the delta file, rows in the base index)."""
+    base = _open_base()
+    if base is None:
+        return 0, 0
+    base[1].close()
+    return len(_read_delta()[0]), base[2]
+
+
+def needs_reweigh():
+    delta, n = pending_rows()
+    return delta > max(REWEIGH_MIN_ROWS, REWEIGH_RATIO * n)
+
+
+def reweigh():
+    """Merge the delta into the base index and re-weigh every row with the current df.
+
+    Works from the stored term counts, so no catalogue read is needed. Returns row count.
+    """
+    base = _open_base()
+    if base is None:
+        return 0
+    meta, mm, n, nnz = base
+    views = _base_arrays(mm, n, nnz)
+    row_ptr, row_idx, row_cnt = views[1], views[2], views[3]
+    try:
+        ids = list(meta["ids"])
+        all_counts = [dict(zip(row_idx[row_ptr[d]:row_ptr[d + 1]], row_cnt[row_ptr[d]:row_ptr[d + 1]]))
+                      for d in range(n)]
+    finally:
+        _release(views, mm)
+    known = set(ids)
+    for idea_id, buckets, counts, _ in _read_delta()[0]:
+        if idea_id in known:
+            continue
+        ids.append(idea_id)
+        all_counts.append(dict(zip(buckets, counts)))
+
+    df = {}
+    for counts in all_counts:
+        for b in counts:
+            df[b] = df.get(b, 0) + 1
+    _write_rows(ids, all_counts, df)
+    return len(ids)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  QUERY
+# ═══════════════════════════════════════════════════════════════════════════
+def load_index():
+    """Memory-map the base index and read the delta. Returns None if there is no index yet."""
+    base = _open_base()
+    if base is None:
+        return None
+    meta, mm, n, nnz = base
+    views = _base_arrays(mm, n, nnz)
+    row_ptr, row_idx, _, row_val, col_ptr, col_doc, col_val = views[1:]
+
+    # Delta rows are few; keep them (and their postings) in memory, numbered after the base.
+    # Rows already in the base are left over from a re-weigh interrupted before the delta went.
+    ids = list(meta["ids"])
+    pos = {idea_id: p for p, idea_id in enumerate(ids)}
+    delta_rows, delta_postings = [], {}
+    for idea_id, buckets, _, weights in _read_delta()[0]:
+        if idea_id in pos:
+            continue
+        pos[idea_id] = len(ids)
+        for b, w in zip(buckets, weights):
+            delta_postings.setdefault(b, []).append((len(ids), w))
+        ids.append(idea_id)
+        delta_rows.append((buckets, weights))
+
+    return {
+        "ids": ids,
+        "pos": pos,
+        "n": len(ids),
+        "base_n": n,
+        "row_ptr": row_ptr, "row_idx": row_idx, "row_val": row_val,
+        "col_ptr": col_ptr, "col_doc": col_doc, "col_val": col_val,
+        "delta_rows": delta_rows, "delta_postings": delta_postings,
+        "_mmap": mm, "_views": views,
+    }
+
+
+def close_index(index):
+    _release(index["_views"], index["_mmap"])
+
+
+def most_similar(index, idea_id, k=5):
+    """Top-k (id, cosine) neighbours of idea_id, best first. [] if id is unknown.
+
+    Rows are L2-normalized, so the full sparse dot product is the cosine.
+    """
+    doc = index["pos"].get(idea_id)
+    if doc is None:
+        return []
+
+    col_ptr, col_doc, col_val = index["col_ptr"], index["col_doc"], index["col_val"]
+    delta_postings = index["delta_postings"]
+
+    if doc < index["base_n"]:
+        lo, hi = index["row_ptr"][doc], index["row_ptr"][doc + 1]
+        buckets, weights = index["row_idx"][lo:hi], index["row_val"][lo:hi]
+    else:
+        buckets, weights = index["delta_rows"][doc - index["base_n"]]
+
+    # Sparse product of the query row against the postings (CSC) of every bucket it uses
+    scores = {}
+    get = scores.get
+    for qw, b in zip(weights, buckets):
+        lo, hi = col_ptr[b], col_ptr[b + 1]
+        for d, w in zip(col_doc[lo:hi], col_val[lo:hi]):
+            scores[d] = get(d, 0.0) + qw * w
+        for d, w in delta_postings.get(b, ()):
+            scores[d] = get(d, 0.0) + qw * w
+
+    scores.pop(doc, None)
+    ids = index["ids"]
+    best = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+    return [(ids[d], round(s, 4)) for d, s in best]
+
+
+def neighbour_ids(idea_ids, k=3, known=None):
+    """Ids of the k nearest ideas to each of idea_ids, excluding those ideas (reply flow).
+
+    known, if given, is the set of ids still in the catalogue; others are skipped.
+    """
+    index = load_index()
+    if index is None:
+        return []
+    try:
+        seen = set(idea_ids)
+        found = []
+        for idea_id in idea_ids:
+            taken = 0
+            for nid, _ in most_similar(index, idea_id, k + len(seen)):
+                if taken == k:
+                    break
+                if nid not in seen and (known is None or nid in known):
+                    seen.add(nid)
+                    found.append(nid)
+                    taken += 1
+        return found
+    finally:
+        close_index(index)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+def synthetic_ideas(n, seed=7):
+    """Catalogue of n ideas built from the real vocabulary, for benchmarks."""
+    rng = random.Random(seed)
+    base = load_json(IDEAS_FILE)
+    vocab = sorted({t for i in base for f in TEXT_FIELDS for t in tokenize(str(i.get(f, "")))})
+    categories = sorted({i["category"] for i in base})
+    out = []
+    for k in range(n):
+        out.append({
+            "id": f"syn{k:07d}",
+            "business_name": " ".join(rng.sample(vocab, 2)).title(),
+            "category": rng.choice(categories),
+            "what_it_does": " ".join(rng.choices(vocab, k=30)),
+            "why_growing": " ".join(rng.choices(vocab, k=20)),
+            "nepal_adaptation": " ".join(rng.choices(vocab, k=20)),
+            "monetization": " ".join(rng.choices(vocab, k=8)),
+        })
+    return out
+
+
+def benchmark(n, queries=200):
+    global INDEX_META_FILE, INDEX_DATA_FILE, INDEX_DELTA_FILE
+    saved = INDEX_META_FILE, INDEX_DATA_FILE, INDEX_DELTA_FILE
+    INDEX_META_FILE = BASE_DIR / "bench_similarity_index.json"
+    INDEX_DATA_FILE = BASE_DIR / "bench_similarity_index.bin"
+    INDEX_DELTA_FILE = BASE_DIR / "bench_similarity_index.delta"
+    try:
+        ideas = synthetic_ideas(n)
+        t0 = time.perf_counter()
+        update_index(ideas[: n - 100], rebuild=True)
+        t1 = time.perf_counter()
+        update_index(ideas[n - 100:])
+        t2 = time.perf_counter()
+        index = load_index()
+        t3 = time.perf_counter()
+        rng = random.Random(1)
+        for idea_id in rng.sample(index["ids"], min(queries, n)):
+            most_similar(index, idea_id, 10)
+        t4 = time.perf_counter()
+        close_index(index)
+        t5 = time.perf_counter()
+        reweigh()
+        t6 = time.perf_counter()
+        print(f"📊 {n:,} ideas, {INDEX_DATA_FILE.stat().st_size / 1e6:.1f} MB index")
+        print(f"   full build:        {t1 - t0:8.2f} s")
+        print(f"   ingest 100 ideas:  {(t2 - t1) * 1000:8.1f} ms")
+        print(f"   mmap load:         {(t3 - t2) * 1000:8.1f} ms")
+        print(f"   top-10 query:      {(t4 - t3) * 1000 / min(queries, n):8.2f} ms avg")
+        print(f"   re-weigh:          {t6 - t5:8.2f} s")
+    finally:
+        for fp in (INDEX_META_FILE, INDEX_DATA_FILE, INDEX_DELTA_FILE):
+            if fp.exists():
+                fp.unlink()
+        INDEX_META_FILE, INDEX_DATA_FILE, INDEX_DELTA_FILE = saved
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Find ideas similar to a given idea id.")
+    parser.add_argument("idea_id", nargs="?")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--rebuild", action="store_true", help="re-vectorize the whole catalogue")
+    parser.add_argument("--reweigh", action="store_true", help="merge appended rows and re-weigh every row")
+    parser.add_argument("--bench", type=int, metavar="N", help="benchmark on N synthetic ideas")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+        return
+
+    if args.reweigh:
+        print(f"♻ Re-weighed {reweigh()} row(s)")
+
+    ideas = idea_shards.load_ideas()
+    added = update_index(ideas, rebuild=args.rebuild)
+    if added:
+        print(f"✅ Indexed {added} idea(s)")
+    if not args.idea_id:
+        return
+
+    by_id = {i["id"]: i for i in ideas}
+    index = load_index()
+    try:
+        if args.idea_id not in index["pos"]:
+            print(f"❌ Unknown idea id: {args.idea_id}")
+            sys.exit(1)
+        print(f"💡 More like {by_id[args.idea_id]['business_name']}:")
+        for nid, score in most_similar(index, args.idea_id, args.k):
+            print(f"   {score:.3f}  {nid:<10} {by_id.get(nid, {}).get('business_name', '?')}")
+    finally:
+        close_index(index)
+
+
+if __name__ == "__main__":
+    with state_files.state_lock():     # indexing writes the same files as update_database.py
+        main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Selection Simulator
+Fast-forwards the daily selection policy (select_ideas: unsent first,
+priority ideas before regular ones, the variety rules from config.json, full
+reset when fewer than `count` unsent remain) over thousands of days, with
+periodic update_database.py-style ingests, and reports coverage, fairness and
+how often the rules had to be relaxed.
+
+The default engine runs idea_selection.IdeaPools itself over flat per-idea
+arrays (category, cost tier, high-risk flag, priority) instead of records,
+so it applies exactly the sender's rules at a few bytes per idea.
+`--engine reference` calls the real select_ideas on stub records. Synthetic
+catalogues get cost tiers and high-risk flags in the shipped catalogue's
+proportions, so mix_costs and max_high_risk are exercised too.
+
+Usage:
+    python simulate_selection.py                                  # real catalogue, 5 years
+    python simulate_selection.py --ideas 1000000 --days 3650 --ingest-every 7 --ingest-size 10
+    python simulate_selection.py --ideas 200 --days 2000 --engine reference
+    python simulate_selection.py --ideas 20000 --no-rules         # the policy without variety rules
+"""
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+
+import idea_selection
+import idea_shards
+
+BASE_DIR = Path(__file__).parent
+CONFIG_FILE = BASE_DIR / "config.json"
+
+COST_NAMES = ("Low", "Medium", "High", None)    # cost code -> startup_cost
+SYNTHETIC_COSTS = (25, 13, 6, 0)                # weights per cost code (shipped catalogue: 25/13/6)
+SYNTHETIC_HIGH_RISK = 6 / 44                    # share of is_high_risk ideas in the shipped catalogue
+
+
+def load_json(fp):
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CATALOGUE
+# ═══════════════════════════════════════════════════════════════════════════
+def synthetic_flags(n, rng):
+    """Cost codes and high-risk flags for n synthetic ideas."""
+    costs = array("B", rng.choices(range(len(COST_NAMES)), weights=SYNTHETIC_COSTS, k=n))
+    risks = bytearray(rng.random() < SYNTHETIC_HIGH_RISK for _ in range(n))
+    return costs, risks
+
+
+def synthetic_catalogue(n, categories, rng):
+    """(categories, costs, risks) per idea, Zipf-like category sizes; no priority flags."""
+    weights = [1 / (k + 1) for k in range(categories)]
+    cats = array("H", rng.choices(range(categories), weights=weights, k=n))
+    return (cats,) + synthetic_flags(n, rng)
+
+
+def real_catalogue():
+    ideas = idea_shards.load_ideas()     # the shards once split, ideas_database.json before
+    names = sorted({i["category"] for i in ideas})
+    code = {c: k for k, c in enumerate(names)}
+    cost_code = {c: k for k, c in enumerate(COST_NAMES)}
+    cats = array("H", (code[i["category"]] for i in ideas))
+    costs = array("B", (cost_code.get(i.get("startup_cost") or None, 3) for i in ideas))
+    risks = bytearray(bool(i.get("is_high_risk")) for i in ideas)
+    priority = [k for k, i in enumerate(ideas) if i.get("priority") is True]
+    return (cats, costs, risks), names, priority
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ENGINES
+# ═══════════════════════════════════════════════════════════════════════════
+class PoolEngine(idea_selection.IdeaPools):
+    """IdeaPools over per-idea arrays; the pools hold positions, which double as ids.
+
+    Only the storage is replaced — candidate pools, rule relaxation and the
+    size-weighted draw are IdeaPools.select itself. Ingests add to the pools
+    instead of rebuilding them.
+    """
+
+    def __init__(self, catalogue, priority, rng, rules):
+        cats, costs, risks = catalogue
+        self.cats, self.costs, self.risks = array("H", cats), array("B", costs), bytearray(risks)
+        self.priority = bytearray(len(cats))
+        for i in priority:
+            self.priority[i] = 1
+        self.pools, self.slot, self.count = {}, array("I"), 0
+        self.rng, self.rules = rng, rules
+        self.resets, self.relaxed = 0, Counter()
+        self.reset()
+
+    def _key(self, n):
+        # Same shape as idea_selection.pool_key(), with codes for category and cost
+        return (self.priority[n] == 1, self.cats[n], self.costs[n], self.risks[n] == 1)
+
+    def reset(self):
+        self.pools.clear()
+        self.slot = array("I", bytes(4 * len(self.cats)))
+        self.count = 0
+        for n in range(len(self.cats)):
+            self._add(n)
+
+    def __len__(self):
+        return self.count
+
+    def _add(self, n):
+        key = self._key(n)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = array("I")
+        self.slot[n] = len(pool)
+        pool.append(n)
+        self.count += 1
+
+    def _pick(self, n):
+        key = self._key(n)
+        pool = self.pools[key]
+        moved = pool.pop()
+        if moved != n:
+            pool[self.slot[n]] = moved
+            self.slot[moved] = self.slot[n]
+        if not pool:
+            del self.pools[key]
+        self.count -= 1
+        return n
+
+    def add(self, cats, costs, risks):
+        """Ingest new priority ideas; returns their indexes."""
+        start = len(self.cats)
+        self.cats.extend(cats)
+        self.costs.extend(costs)
+        self.risks.extend(risks)
+        self.priority.extend(b"\x01" * len(cats))
+        self.slot.frombytes(bytes(4 * len(cats)))
+        for n in range(start, len(self.cats)):
+            self._add(n)
+        return range(start, len(self.cats))
+
+    def briefing(self, count):
+        if len(self) < count:
+            self.resets += 1
+            self.reset()
+        chosen, relaxed = self.select(count, self.rules, self.rng)
+        for n in chosen:
+            self._pick(n)
+        self.relaxed.update(set(relaxed))
+        return chosen
+
+
+class ReferenceEngine:
+    """Calls daily_ideas_sender.select_ideas on a list of stub records."""
+
+    def __init__(self, catalogue, priority, rng, rules):
+        import daily_ideas_sender
+        logging.getLogger(daily_ideas_sender.log.name).setLevel(logging.ERROR)
+        self.select_ideas = daily_ideas_sender.select_ideas
+        self.rules = rules
+        random.seed(rng.random())
+        prio = set(priority)
+        self.ideas = [self._stub(i, c, cost, risk, i in prio) for i, (c, cost, risk) in enumerate(zip(*catalogue))]
+        self.history = {"sent_ids": [], "log": []}
+        self.resets = 0
+        self.relaxed = None         # select_ideas only logs relaxations
+
+    @staticmethod
+    def _stub(i, cat, cost, risk, priority):
+        return {"id": i, "category": cat, "priority": priority,
+                "startup_cost": COST_NAMES[cost], "is_high_risk": bool(risk)}
+
+    def add(self, cats, costs, risks):
+        start = len(self.ideas)
+        self.ideas.extend(self._stub(i, c, cost, risk, True)
+                          for i, (c, cost, risk) in enumerate(zip(cats, costs, risks), start))
+        return range(start, len(self.ideas))
+
+    def briefing(self, count):
+        before = len(self.history["sent_ids"])
+        chosen, self.history = self.select_ideas(self.ideas, self.history, count, self.rules)
+        if len(self.history["sent_ids"]) < before:
+            self.resets += 1
+        ids = [i["id"] for i in chosen]
+        self.history["sent_ids"].extend(ids)
+        return ids
+
+
+ENGINES = {"pools": PoolEngine, "reference": ReferenceEngine}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════
+def gini(values):
+    xs = sorted(values)
+    n, total = len(xs), sum(xs)
+    if not n or not total:
+        return 0.0
+    weighted = sum((k + 1) * x for k, x in enumerate(xs))
+    return (2 * weighted) / (n * total) - (n + 1) / n
+
+
+def percentile(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else 0
+
+
+def simulate(catalogue, priority, days, runs_per_day, count, ingest_every, ingest_size,
+             categories, engine="pools", seed=11, rules=None):
+    rng = random.Random(seed)
+    eng = ENGINES[engine](catalogue, priority, rng, rules or {})
+    cats, costs, risks = array("H", catalogue[0]), array("B", catalogue[1]), bytearray(catalogue[2])
+    sends = array("I", bytes(4 * len(cats)))
+    ingested_on = {}            # idea -> day it was ingested
+    first_sent = {}             # ingested idea -> day of its first send
+    reset_days = []
+    total = briefings = 0
+    shape = Counter()           # briefings with a repeated category / >1 high-risk / one cost tier only
+
+    for day in range(days):
+        if ingest_every and day and day % ingest_every == 0:
+            new_cats = array("H", rng.choices(range(categories), k=ingest_size))
+            new_costs, new_risks = synthetic_flags(ingest_size, rng)
+            new = eng.add(new_cats, new_costs, new_risks)
+            cats.extend(new_cats)
+            costs.extend(new_costs)
+            risks.extend(new_risks)
+            sends.extend(array("I", bytes(4 * ingest_size)))
+            for i in new:
+                ingested_on[i] = day
+        for _ in range(runs_per_day):
+            resets = eng.resets
+            chosen = eng.briefing(count)
+            for i in chosen:
+                if sends[i] == 0 and i in ingested_on:
+                    first_sent[i] = day
+                sends[i] += 1
+                total += 1
+            briefings += 1
+            shape["repeated_category"] += len({cats[i] for i in chosen}) < len(chosen)
+            shape["high_risk_over_1"] += sum(risks[i] for i in chosen) > 1
+            shape["single_cost"] += len(chosen) > 1 and len({costs[i] for i in chosen}) == 1
+            if eng.resets != resets:
+                reset_days.append(day)
+
+    waits = [first_sent[i] - d for i, d in ingested_on.items() if i in first_sent]
+    per_cat_sends, per_cat_size = Counter(), Counter(cats)
+    for i, c in enumerate(cats):
+        per_cat_sends[c] += sends[i]
+    unique = sum(1 for s in sends if s)
+    return {
+        "ideas": len(cats), "days": days, "sends": total, "unique_sent": unique,
+        "never_sent": len(cats) - unique,
+        "repeat_rate": (total - unique) / total if total else 0.0,
+        "resets": len(reset_days),
+        "cycle_days": [b - a for a, b in zip(reset_days, reset_days[1:])],
+        "ingested": len(ingested_on), "priority_waits": waits,
+        "priority_unsent": len(ingested_on) - len(waits),
+        "gini": gini(sends),
+        "briefings": briefings, "shape": shape, "relaxed": eng.relaxed,
+        "category_share": {c: (per_cat_sends[c] / total if total else 0.0, per_cat_size[c] / len(cats))
+                           for c in per_cat_size},
+    }
+
+
+def report(stats, names, rules, elapsed):
+    print(f"📊 {stats['ideas']:,} ideas, {stats['days']:,} days, {stats['sends']:,} sends  ({elapsed:.2f} s)")
+    print(f"   rules:         {rules or 'none'}")
+    print(f"   coverage:      {stats['unique_sent']:,} sent at least once, {stats['never_sent']:,} never")
+    print(f"   repeat rate:   {stats['repeat_rate'] * 100:.1f}% of sends were repeats")
+    cycles = stats["cycle_days"]
+    cycle_txt = f", every {statistics.median(cycles):g} days (median)" if cycles else ""
+    print(f"   resets:        {stats['resets']} 'Cycling database' resets{cycle_txt}")
+    waits = stats["priority_waits"]
+    if stats["ingested"]:
+        wait_txt = (f"median {statistics.median(waits):g}, p95 {percentile(waits, 0.95)}, max {max(waits)} days"
+                    if waits else "none sent yet")
+        print(f"   priority wait: {stats['ingested']:,} ingested, {wait_txt}; {stats['priority_unsent']:,} still waiting")
+    print(f"   fairness:      Gini of per-idea sends {stats['gini']:.3f}")
+    n, shape = stats["briefings"] or 1, stats["shape"]
+    print(f"   variety:       {shape['repeated_category'] / n * 100:.1f}% of briefings repeat a category, "
+          f"{shape['high_risk_over_1'] / n * 100:.1f}% carry >1 high-risk idea, "
+          f"{shape['single_cost'] / n * 100:.1f}% use a single cost tier")
+    if stats["relaxed"] is not None:
+        relaxed = ", ".join(f"{rule} in {k / n * 100:.1f}% of briefings" for rule, k in stats["relaxed"].most_common())
+        print(f"   relaxed rules: {relaxed or 'never'}")
+    print("   category share of sends vs catalogue (top 8):")
+    shares = sorted(stats["category_share"].items(), key=lambda kv: -kv[1][1])[:8]
+    for c, (sent, size) in shares:
+        print(f"      {sent * 100:5.1f}% vs {size * 100:5.1f}%  {names[c] if names else f'category {c}'}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Simulate idea selection over many days.")
+    parser.add_argument("--ideas", type=int, help="synthetic catalogue size (default: real database)")
+    parser.add_argument("--categories", type=int, default=17)
+    parser.add_argument("--days", type=int, default=5 * 365)
+    parser.add_argument("--runs-per-day", type=int, default=2)
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--ingest-every", type=int, default=0, help="days between ingests (0 = none)")
+    parser.add_argument("--ingest-size", type=int, default=10)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="pools")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--no-rules", action="store_true", help="ignore the variety rules from config.json")
+    args = parser.parse_args()
+    config = load_json(CONFIG_FILE) if CONFIG_FILE.exists() else {}
+    rules = {} if args.no_rules else idea_selection.load_constraints(config)
+
+    if args.ideas:
+        catalogue = synthetic_catalogue(args.ideas, args.categories, random.Random(args.seed))
+        names, priority, categories = None, [], args.categories
+    else:
+        catalogue, names, priority = real_catalogue()
+        categories = len(names)
+
+    started = time.perf_counter()
+    stats = simulate(catalogue, priority, args.days, args.runs_per_day, args.count,
+                     args.ingest_every, args.ingest_size, categories, args.engine, args.seed, rules)
+    if names:
+        names = names + [f"category {c}" for c in range(len(names), categories)]
+    report(stats, names, rules, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Daily Business Ideas — Shared State Helpers
+A cross-process lock around the JSON state files (history, pending, processed
+replies, database) and an mtime-keyed cache for read-only JSON such as
+config.json and the catalogue, so a resident process only re-parses a file
+after it changes on disk.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+LOCK_FILE = BASE_DIR / "state.lock"
+
+_cache = {}
+
+
+@contextmanager
+def state_lock(fp=LOCK_FILE):
+    """Exclusive lock held while a job reads and rewrites state files."""
+    with open(fp, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            # LK_LOCK retries for ~10s; keep trying so a long send can't fail the waiter
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def load_cached(fp):
+    """Parsed JSON for fp, re-read only when its mtime/size change.
+
+    The returned object is shared between callers — treat it as read-only.
+    """
+    fp = Path(fp)
+    st = fp.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _cache.get(fp)
+    if hit and hit[0] == key:
+        return hit[1]
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    _cache[fp] = (key, data)
+    return data
@@ -1,18 +1,30 @@
 import json
 from pathlib import Path
 
+import derived_fields
+import idea_shards
+import similar_ideas
+import state_files
+import validate_database
+
 BASE_DIR = Path(__file__).parent
 DB_FILE = BASE_DIR / "ideas_database.json"
 FRESH_FILE = BASE_DIR / "fresh_ideas.json"
+HISTORY_FILE = BASE_DIR / "sent_history.json"
 
 def main():
     if not FRESH_FILE.exists():
         print("❌ fresh_ideas.json not found!")
         return
 
-    with open(DB_FILE, "r", encoding="utf-8") as f:
-        existing = json.load(f)
-    
+    # Gate: refuse to merge records the email renderers can't handle
+    _, violations = validate_database.validate_file(FRESH_FILE)
+    if violations:
+        for label, msg in violations:
+            print(f"❌ {label}: {msg}")
+        print(f"❌ fresh_ideas.json has {len(violations)} problem(s) — nothing merged.")
+        return
+
     with open(FRESH_FILE, "r", encoding="utf-8") as f:
         fresh = json.load(f)
 
@@ -21,22 +33,46 @@ def main():
         idea["priority"] = True
     
     # Check for duplicates by ID
-    existing_ids = {i["id"] for i in existing}
-    added_count = 0
+    existing_ids = idea_shards.all_ids()
+    added = []
     
     for idea in fresh:
         if idea["id"] not in existing_ids:
-            existing.append(idea)
-            added_count += 1
+            existing_ids.add(idea["id"])
+            added.append(idea)
             print(f"➕ Added: {idea['business_name']}")
         else:
             print(f"⚠ Skipped duplicate: {idea['business_name']}")
     
-    with open(DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(existing, f, indent=2, ensure_ascii=False)
+    # Precompute display fields once here instead of on every render
+    derived_fields.refresh(added)
+
+    if idea_shards.is_sharded():
+        history = idea_shards.load_json(HISTORY_FILE) if HISTORY_FILE.exists() else {}
+        touched = idea_shards.add_ideas(added, history.get("sent_ids", []))
+        if touched:
+            print(f"🗂 Rewrote shards: {', '.join(touched)}")
+    else:
+        with open(DB_FILE, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+        derived_fields.refresh(existing)     # only records whose source text changed
+        existing.extend(added)
+        with open(DB_FILE, "w", encoding="utf-8") as f:
+            json.dump(existing, f, indent=2, ensure_ascii=False)
         
-    print(f"✅ Successfully added {added_count} new ideas to database.")
-    print(f"📊 Total Database Size: {len(existing)} ideas")
+    print(f"✅ Successfully added {len(added)} new ideas to database.")
+    print(f"📊 Total Database Size: {len(existing_ids)} ideas")
+
+    # Only the new ideas are vectorized; the whole catalogue is read just when there is no index yet
+    if similar_ideas.index_exists():
+        indexed = similar_ideas.update_index(added)
+    else:
+        indexed = similar_ideas.update_index(idea_shards.load_ideas(), rebuild=True)
+    print(f"🔎 Similarity index updated (+{indexed} ideas)")
+    # Appended rows keep the df of their ingest; fold them in once they add up
+    if similar_ideas.needs_reweigh():
+        print(f"♻ Re-weighed similarity index ({similar_ideas.reweigh()} ideas)")
 
 if __name__ == "__main__":
-    main()
+    with state_files.state_lock():
+        main()
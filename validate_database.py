@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Daily Business Ideas — Database Validator / Linter
+Checks every idea record for the fields the email renderers index directly,
+so one bad record can't crash the morning send. Streams the JSON array record
+by record. With --jobs the file is cut into byte ranges at record boundaries
+and each worker parses and validates its own range, so only ids and problems
+travel back to the parent (if a cut turns out not to be a real boundary, the
+file is validated serially instead).
+
+Usage:
+    python validate_database.py                      # the catalogue (every shard once split)
+    python validate_database.py fresh_ideas.json
+    python validate_database.py big.json --jobs 8
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+
+import idea_shards
+
+BASE_DIR = Path(__file__).parent
+IDEAS_FILE = BASE_DIR / "ideas_database.json"
+
+CHUNK_SIZE = 1 << 20
+MIN_RANGE_BYTES = 4 << 20     # smaller files aren't worth the worker start-up
+BOUNDARY_RE = re.compile(rb"\}\s*,\s*(?=\{)")     # "}, {" — a likely cut between two records
+
+# Fields read with idea[...] by render_idea_html / build_detail_html
+REQUIRED_TEXT = (
+    "id", "business_name", "category", "what_it_does", "where_working",
+    "why_growing", "nepal_adaptation", "startup_cost", "monetization",
+)
+HIGH_RISK_TEXT = ("high_risk_reason", "high_risk_reward")
+STARTUP_COSTS = {"Low", "Medium", "High"}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SCHEMA
+# ═══════════════════════════════════════════════════════════════════════════
+def _text(field):
+    def check(rec):
+        value = rec.get(field)
+        if value is None:
+            return f"missing '{field}'"
+        if not isinstance(value, str) or not value.strip():
+            return f"'{field}' must be a non-empty string"
+    return check
+
+
+def _startup_cost(rec):
+    value = rec.get("startup_cost")
+    if isinstance(value, str) and value.strip() and value not in STARTUP_COSTS:
+        return f"'startup_cost' must be one of {sorted(STARTUP_COSTS)}, got {value!r}"
+
+
+def _flag(field):
+    def check(rec):
+        if field in rec and not isinstance(rec[field], bool):
+            return f"'{field}' must be true/false"
+    return check
+
+
+def _action_plan(rec):
+    plan = rec.get("action_plan")
+    if plan is None:
+        return None
+    if not isinstance(plan, list) or not plan:
+        return "'action_plan' must be a non-empty list"
+    if not all(isinstance(step, str) and step.strip() for step in plan):
+        return "'action_plan' steps must be non-empty strings"
+
+
+def _high_risk(rec):
+    if rec.get("is_high_risk") is not True:
+        return None
+    missing = [f for f in HIGH_RISK_TEXT if not (isinstance(rec.get(f), str) and rec[f].strip())]
+    if missing:
+        return f"high-risk idea without {', '.join(repr(f) for f in missing)}"
+
+
+def compile_schema():
+    """The full list of record checks; each returns an error string or None."""
+    return (
+        [_text(f) for f in REQUIRED_TEXT]
+        + [_startup_cost, _flag("is_high_risk"), _flag("priority"), _action_plan, _high_risk]
+    )
+
+
+CHECKS = compile_schema()
+
+
+def record_label(rec, index):
+    rid = rec.get("id") if isinstance(rec, dict) else None
+    return rid if isinstance(rid, str) and rid else f"#{index}"
+
+
+def validate_record(rec, index=0):
+    """All violations for one record as (label, message) tuples."""
+    if not isinstance(rec, dict):
+        return [(f"#{index}", "record is not a JSON object")]
+    label = record_label(rec, index)
+    return [(label, msg) for msg in (check(rec) for check in CHECKS) if msg]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  STREAMING
+# ═══════════════════════════════════════════════════════════════════════════
+def iter_records(fp):
+    """Yield records from a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(fp, "r", encoding="utf-8-sig") as f:
+        buf, pos, eof = "", 0, False
+        started = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(CHUNK_SIZE)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def skip_ws():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        fill()
+        skip_ws()
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"{fp}: expected a JSON array of ideas")
+        pos += 1
+
+        while True:
+            skip_ws()
+            if pos >= len(buf):
+                raise ValueError(f"{fp}: unexpected end of file")
+            if buf[pos] == "]":
+                return
+            if started:
+                if buf[pos] != ",":
+                    raise ValueError(f"{fp}: expected ',' between records")
+                pos += 1
+                skip_ws()
+            while True:
+                try:
+                    rec, end = decoder.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill()
+            # A number/literal may have been cut at the chunk edge; objects can't be
+            if end == len(buf) and not eof and not isinstance(rec, (dict, list, str)):
+                fill()
+                continue
+            pos = end
+            started = True
+            yield rec
+
+
+def validate_records(records, seen=None):
+    """Validate an iterable of records. Returns (record_count, violations).
+
+    seen (a set of ids) is updated in place, so duplicates can be caught across files.
+    """
+    seen = set() if seen is None else seen
+    count, violations = 0, []
+    for i, rec in enumerate(records):
+        count += 1
+        rid = rec.get("id") if isinstance(rec, dict) else None
+        if isinstance(rid, str) and rid:
+            if rid in seen:
+                violations.append((rid, "duplicate id"))
+            seen.add(rid)
+        violations.extend(validate_record(rec, i))
+    return count, violations
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  PARALLEL
+# ═══════════════════════════════════════════════════════════════════════════
+def split_ranges(fp, parts):
+    """Byte ranges of the array body, cut just before a record about size/parts apart.
+
+    Returns None if the file doesn't look like a JSON array. A cut may land
+    inside a string that happens to contain "}, {"; _validate_range catches that.
+    """
+    with open(fp, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            m = re.compile(rb"(?:\xef\xbb\xbf)?\s*\[").match(mm)
+            close = mm.rfind(b"]")
+            if not m or close < m.end() or mm[close + 1:].strip():
+                return None
+            cuts = [m.end()]
+            for k in range(1, parts):
+                target = max(cuts[-1], m.end() + (close - m.end()) * k // parts)
+                hit = BOUNDARY_RE.search(mm, target, close)
+                if hit and hit.end() > cuts[-1]:
+                    cuts.append(hit.end())
+    return list(zip(cuts, cuts[1:] + [close]))
+
+
+def _validate_range(task):
+    """Parse and validate one byte range in a worker.
+
+    Returns (count, ids, [(index in range, id or None, message)]), or None if the
+    range doesn't hold whole records separated by commas — i.e. the cut was bad.
+    """
+    fp, start, end, last = task
+    with open(fp, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    decoder = json.JSONDecoder()
+    ids, found, count, pos = [], [], 0, 0
+    ws = re.compile(r"[ \t\r\n]*")
+    try:
+        while True:
+            pos = ws.match(text, pos).end()
+            if pos == len(text):
+                break
+            rec, pos = decoder.raw_decode(text, pos)
+            pos = ws.match(text, pos).end()
+            if pos < len(text) and text[pos] == ",":
+                pos += 1
+            elif pos < len(text) or not last:
+                return None          # a middle range must end with the comma before the next cut
+            rid = rec.get("id") if isinstance(rec, dict) else None
+            rid = rid if isinstance(rid, str) and rid else None
+            ids.append(rid)
+            found.extend((count, rid, msg) for _, msg in validate_record(rec, count))
+            count += 1
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if last and count and text.rstrip().endswith(","):
+        return None
+    return count, ids, found
+
+
+def validate_parallel(fp, jobs):
+    """validate_file() on a process pool; None if the file couldn't be cut cleanly."""
+    ranges = split_ranges(fp, jobs)
+    if not ranges:
+        return None
+    tasks = [(str(fp), start, end, k == len(ranges) - 1) for k, (start, end) in enumerate(ranges)]
+    with Pool(min(jobs, len(tasks))) as pool:
+        results = pool.map(_validate_range, tasks)
+    if any(r is None for r in results):
+        return None
+
+    seen, total, violations = set(), 0, []
+    for count, ids, found in results:
+        for rid in ids:
+            if rid is not None:
+                if rid in seen:
+                    violations.append((rid, "duplicate id"))
+                seen.add(rid)
+        violations.extend((rid or f"#{total + i}", msg) for i, rid, msg in found)
+        total += count
+    return total, violations
+
+
+def validate_file(fp, jobs=1):
+    if jobs > 1 and os.path.getsize(fp) >= MIN_RANGE_BYTES * 2:
+        result = validate_parallel(fp, jobs)
+        if result is not None:
+            return result
+    return validate_records(iter_records(fp))
+
+
+def validate_shards():
+    """Validate every shard of a sharded catalogue (ids must be unique across shards)."""
+    seen, total, violations = set(), 0, []
+    for entry in idea_shards.load_manifest()["shards"].values():
+        count, found = validate_records(iter_records(idea_shards.SHARDS_DIR / entry["file"]), seen)
+        total += count
+        violations.extend((f"{entry['file']}{label}" if label.startswith("#") else label, msg)
+                          for label, msg in found)
+    return total, violations
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MAIN
+# ═══════════════════════════════════════════════════════════════════════════
+def main():
+    parser = argparse.ArgumentParser(description="Validate an ideas database or ingest file.")
+    parser.add_argument("file", nargs="?", help="default: the catalogue (ideas_database.json or its shards)")
+    parser.add_argument("--jobs", type=int, default=1, help=f"worker processes (this machine: {os.cpu_count()})")
+    args = parser.parse_args()
+
+    try:
+        if args.file is None and idea_shards.is_sharded():
+            count, violations = validate_shards()
+        else:
+            count, violations = validate_file(args.file or IDEAS_FILE, args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    for label, msg in violations:
+        print(f"❌ {label}: {msg}")
+    if violations:
+        print(f"⚠ {len(violations)} problem(s) in {count} records")
+        sys.exit(1)
+    print(f"✅ {count} records OK")
+
+
+if __name__ == "__main__":
+    main()